@@ -1,11 +1,25 @@
 #!/usr/bin/env python3
 import json
+import os
 
 import aws_cdk as cdk
+from aws_cdk import aws_secretsmanager as secretsmanager
 
 from cdk_ecs_application.classes import DeployStep
-from cdk_ecs_application.stacks import AppStack, PipelineStack, RepositoryStack
-from cdk_ecs_application.structs import EcsClusterConfig, RdsClusterConfig
+from cdk_ecs_application.stacks import (
+    AppStack,
+    PipelineStack,
+    RepositoryStack,
+    SecondaryAppStack,
+)
+from cdk_ecs_application.structs import (
+    EcsClusterConfig,
+    LoadTestConfig,
+    MaintenanceConfig,
+    RdsClusterConfig,
+    SecondaryRegionConfig,
+    VpcConfig,
+)
 
 with open("./config.json") as fp:
     config = json.load(fp)
@@ -14,12 +28,64 @@ deploy_step = DeployStep(config["deployStep"])
 
 app = cdk.App()
 
+# AZ lookups need a concrete environment to use more than 2 AZs
+env = cdk.Environment(
+    account=os.getenv("CDK_DEFAULT_ACCOUNT"),
+    region=os.getenv("CDK_DEFAULT_REGION"),
+)
+# stacks referenced from a secondary region export values through SSM
+cross_region_references = any(
+    "secondaryRegion" in stage_config
+    for stage_config in config["stageConfig"].values()
+)
+
+
+def get_global_cluster_identifier(stage: str) -> str | None:
+    if "secondaryRegion" not in config["stageConfig"][stage]:
+        return None
+    return f"{config['applicationName']}-{stage}"
+
+
+def add_secondary_app_stack(
+    construct_id: str,
+    stage: str,
+    app_stack: AppStack,
+    secret: secretsmanager.Secret,
+) -> SecondaryAppStack | None:
+    _config = config["stageConfig"][stage]
+    if "secondaryRegion" not in _config:
+        return None
+
+    secondary_region_config = SecondaryRegionConfig.from_object(
+        _config,
+        repository_stack.image_repository,
+        secret=secret,
+    )
+    secondary_app_stack = SecondaryAppStack(
+        app,
+        construct_id,
+        secondary_region_config=secondary_region_config,
+        aurora_config=RdsClusterConfig.from_object(_config).aurora_config,
+        global_cluster_identifier=get_global_cluster_identifier(stage),
+        db_secret=app_stack.database.cluster.secret,
+        env=cdk.Environment(
+            account=env.account,
+            region=secondary_region_config.region,
+        ),
+        cross_region_references=True,
+    )
+    secondary_app_stack.add_dependency(app_stack)
+    return secondary_app_stack
+
+
 repository_stack = RepositoryStack(
     app,
     "Repository",
     code_repository_name=config["applicationName"],
     image_repository_name=config["applicationName"],
     image_tag_mutability=config["imageTagMutability"],
+    env=env,
+    cross_region_references=cross_region_references,
 )
 
 dev_app_stack = None
@@ -28,26 +94,53 @@ if deploy_step in (DeployStep.DEV, DeployStep.STG, DeployStep.PRD):
     dev_app_stack = AppStack(
         app,
         "DevApplication",
+        vpc_config=VpcConfig.from_object(_config),
         rds_cluster_config=RdsClusterConfig.from_object(_config),
         ecs_cluster_config=EcsClusterConfig.from_object(
             _config,
             repository_stack.image_repository,
             secret=repository_stack.dev_secret,
         ),
+        maintenance_config=MaintenanceConfig.from_object(_config),
+        global_cluster_identifier=get_global_cluster_identifier("development"),
+        env=env,
+        cross_region_references=cross_region_references,
     )
     cdk.Tags.of(dev_app_stack).add("Env", "Development")
 
+    dev_secondary_app_stack = add_secondary_app_stack(
+        "DevSecondaryApplication",
+        stage="development",
+        app_stack=dev_app_stack,
+        secret=repository_stack.dev_secret,
+    )
+    if dev_secondary_app_stack:
+        cdk.Tags.of(dev_secondary_app_stack).add("Env", "Development")
+
 PipelineStack(
     app,
     "Pipeline",
     code_repository=repository_stack.code_repository,
     branch_name=config["buildTargetBranch"],
     image_repository=repository_stack.image_repository,
-    service=(
-        dev_app_stack.web_service.loadbalanced_service.service
+    services=(
+        {
+            service_name: web_service.service
+            for service_name, web_service in dev_app_stack.web_services.items()
+        }
+        if dev_app_stack
+        else {}
+    ),
+    soci_index=config.get("sociIndex", False),
+    load_test_config=(
+        LoadTestConfig.from_object(config) if "loadTest" in config else None
+    ),
+    load_test_host=(
+        dev_app_stack.web_service.listener.load_balancer.load_balancer_dns_name  # noqa
         if dev_app_stack
         else None
     ),
+    env=env,
 )
 
 if deploy_step in (DeployStep.STG, DeployStep.PRD):
@@ -55,29 +148,57 @@ if deploy_step in (DeployStep.STG, DeployStep.PRD):
     stg_app_stack = AppStack(
         app,
         "StgApplication",
+        vpc_config=VpcConfig.from_object(_config),
         rds_cluster_config=RdsClusterConfig.from_object(_config),
         ecs_cluster_config=EcsClusterConfig.from_object(
             _config,
             repository_stack.image_repository,
             secret=repository_stack.stg_secret,
         ),
+        maintenance_config=MaintenanceConfig.from_object(_config),
+        global_cluster_identifier=get_global_cluster_identifier("staging"),
+        env=env,
+        cross_region_references=cross_region_references,
     )
     cdk.Tags.of(stg_app_stack).add("Env", "Staging")
 
+    stg_secondary_app_stack = add_secondary_app_stack(
+        "StgSecondaryApplication",
+        stage="staging",
+        app_stack=stg_app_stack,
+        secret=repository_stack.stg_secret,
+    )
+    if stg_secondary_app_stack:
+        cdk.Tags.of(stg_secondary_app_stack).add("Env", "Staging")
+
 if deploy_step in (DeployStep.PRD,):
     _config = config["stageConfig"]["production"]
     prd_app_stack = AppStack(
         app,
         "PrdApplication",
+        vpc_config=VpcConfig.from_object(_config),
         rds_cluster_config=RdsClusterConfig.from_object(_config),
         ecs_cluster_config=EcsClusterConfig.from_object(
             _config,
             repository_stack.image_repository,
             secret=repository_stack.prd_secret,
         ),
+        maintenance_config=MaintenanceConfig.from_object(_config),
         backup_target_tag={"Env": "Production"},
         enable_alarm=True,
+        global_cluster_identifier=get_global_cluster_identifier("production"),
+        env=env,
+        cross_region_references=cross_region_references,
     )
     cdk.Tags.of(prd_app_stack).add("Env", "Production")
 
+    prd_secondary_app_stack = add_secondary_app_stack(
+        "PrdSecondaryApplication",
+        stage="production",
+        app_stack=prd_app_stack,
+        secret=repository_stack.prd_secret,
+    )
+    if prd_secondary_app_stack:
+        cdk.Tags.of(prd_secondary_app_stack).add("Env", "Production")
+
 app.synth()
@@ -0,0 +1,302 @@
+import argparse
+import copy
+import json
+import math
+import sys
+from datetime import datetime
+from typing import Any
+
+from .presets import FARGATE_TASK_SIZES
+
+STATISTIC_KEYS = ["Average", "Maximum", "Sum", "Minimum", "SampleCount"]
+# max capacity is sized for this multiple of the observed peak
+PEAK_HEADROOM = 1.5
+MIN_CPU_PERCENT = 40
+CPU_PERCENT_STEP = 10
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def load_metric(path: str) -> dict[datetime, float]:
+    with open(path) as fp:
+        data = json.load(fp)
+
+    if "MetricDataResults" in data:
+        result = data["MetricDataResults"][0]
+        return {
+            _parse_timestamp(timestamp): value
+            for timestamp, value in zip(result["Timestamps"], result["Values"])
+        }
+
+    datapoints = data["Datapoints"]
+    if not datapoints:
+        return {}
+    keys = [key for key in STATISTIC_KEYS if key in datapoints[0]]
+    if keys:
+        return {
+            _parse_timestamp(datapoint["Timestamp"]): datapoint[keys[0]]
+            for datapoint in datapoints
+        }
+    return {
+        _parse_timestamp(datapoint["Timestamp"]): next(
+            iter(datapoint["ExtendedStatistics"].values())
+        )
+        for datapoint in datapoints
+    }
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    values = sorted(values)
+    index = max(0, int(round(len(values) * percent / 100)) - 1)
+    return values[index]
+
+
+def _find_web_config(
+    stage_config: dict[str, Any], service_name: str
+) -> dict[str, Any]:
+    web_configs = stage_config["ecs"]["web"]
+    if isinstance(web_configs, dict):
+        web_configs = [web_configs]
+    for web_config in web_configs:
+        if web_config.get("serviceName", "web") == service_name:
+            return web_config
+    raise ValueError(f"web service `{service_name}` is not found")
+
+
+def recommend_cpu_percent(
+    cpu_utilization: dict[datetime, float],
+    latency: dict[datetime, float],
+    cpu_percent: int,
+    latency_slo_ms: float,
+) -> int:
+    # target tracking keeps utilization just below the target, lower the
+    # target while latency in that band breaks the SLO
+    while cpu_percent > MIN_CPU_PERCENT:
+        latencies_near_target = [
+            value * 1000
+            for timestamp, value in latency.items()
+            if timestamp in cpu_utilization
+            and cpu_percent - CPU_PERCENT_STEP
+            <= cpu_utilization[timestamp]
+            <= cpu_percent
+        ]
+        if (
+            not latencies_near_target
+            or _percentile(latencies_near_target, 95) <= latency_slo_ms
+        ):
+            break
+        cpu_percent -= CPU_PERCENT_STEP
+    return cpu_percent
+
+
+def recommend_task_size(
+    peak_cpu_demand: float,
+    required_memory: float,
+    cpu_percent: int,
+    max_tasks: int,
+) -> tuple[int, int]:
+    candidates = [
+        (cpu, memory)
+        for cpu, memories in sorted(FARGATE_TASK_SIZES.items())
+        for memory in memories
+        if memory >= required_memory
+    ]
+    if not candidates:
+        raise ValueError(
+            f"no Fargate task size has {required_memory:.0f} MiB of memory"
+        )
+    for cpu, memory in candidates:
+        tasks = math.ceil(peak_cpu_demand / (cpu * cpu_percent / 100))
+        if tasks <= max_tasks:
+            return cpu, memory
+    # the largest cpu with the smallest memory it allows, max capacity goes
+    # beyond `max_tasks` instead
+    largest_cpu = candidates[-1][0]
+    return next(
+        (cpu, memory) for cpu, memory in candidates if cpu == largest_cpu
+    )
+
+
+def advise(
+    web_config: dict[str, Any],
+    cpu_utilization: dict[datetime, float],
+    memory_utilization: dict[datetime, float],
+    task_count: dict[datetime, float] | None = None,
+    request_count: dict[datetime, float] | None = None,
+    latency: dict[datetime, float] | None = None,
+    latency_slo_ms: float | None = None,
+    min_tasks: int = 1,
+    max_tasks: int = 10,
+) -> tuple[dict[str, Any], list[str]]:
+    if not cpu_utilization or not memory_utilization:
+        raise ValueError("cpu and memory metrics must not be empty")
+
+    auto_scaling_config = web_config.get("autoScaling", {})
+    default_tasks = auto_scaling_config.get("minCapacity", 1)
+    tasks = {
+        timestamp: (task_count or {}).get(timestamp, default_tasks)
+        for timestamp in cpu_utilization
+    }
+
+    # cpu is shared by the tasks of the service, memory is held by each task
+    cpu_demands = [
+        value / 100 * web_config["cpu"] * tasks[timestamp]
+        for timestamp, value in cpu_utilization.items()
+    ]
+    peak_memory = max(memory_utilization.values()) / 100 * web_config["memory"]
+
+    cpu_percent = auto_scaling_config.get("cpuPercent", 70)
+    if latency and latency_slo_ms:
+        cpu_percent = recommend_cpu_percent(
+            cpu_utilization,
+            latency=latency,
+            cpu_percent=cpu_percent,
+            latency_slo_ms=latency_slo_ms,
+        )
+    memory_percent = auto_scaling_config.get("memoryPercent", 70)
+    sidecar_memory = sum(
+        sidecar_config.get("memory", 0)
+        for sidecar_config in web_config.get("sidecars", [])
+    )
+    required_memory = max(
+        peak_memory / (memory_percent / 100), sidecar_memory + 1
+    )
+
+    peak_cpu_demand = max(cpu_demands)
+    cpu, memory = recommend_task_size(
+        peak_cpu_demand * PEAK_HEADROOM,
+        required_memory=required_memory,
+        cpu_percent=cpu_percent,
+        max_tasks=max_tasks,
+    )
+    task_cpu_capacity = cpu * cpu_percent / 100
+    min_capacity = max(
+        min_tasks, math.ceil(_percentile(cpu_demands, 10) / task_cpu_capacity)
+    )
+    max_capacity = max(
+        min_capacity,
+        math.ceil(peak_cpu_demand * PEAK_HEADROOM / task_cpu_capacity),
+    )
+
+    notes = [
+        f"peak cpu demand: {peak_cpu_demand:.0f} units",
+        f"peak memory per task: {peak_memory:.0f} MiB",
+        f"task size: cpu {web_config['cpu']} -> {cpu}, memory {web_config['memory']} -> {memory}",  # noqa
+        f"capacity: {min_capacity} - {max_capacity} tasks",
+        f"cpu target: {auto_scaling_config.get('cpuPercent', 70)} -> {cpu_percent} %",  # noqa
+    ]
+    if not task_count:
+        notes.append(
+            f"no task count metric, assumed {default_tasks} running tasks"
+        )
+    if request_count:
+        peak_requests_per_task = max(
+            value / tasks.get(timestamp, default_tasks)
+            for timestamp, value in request_count.items()
+        )
+        notes.append(
+            f"peak requests per task: {peak_requests_per_task:.0f} / period"
+        )
+
+    recommended_web_config = copy.deepcopy(web_config)
+    recommended_web_config["cpu"] = cpu
+    recommended_web_config["memory"] = memory
+    recommended_web_config["autoScaling"] = {
+        **auto_scaling_config,
+        "minCapacity": min_capacity,
+        "maxCapacity": max_capacity,
+        "cpuPercent": cpu_percent,
+        "memoryPercent": memory_percent,
+    }
+    return recommended_web_config, notes
+
+
+def build_patch(
+    config: dict[str, Any],
+    stage: str,
+    service_name: str,
+    recommended_web_config: dict[str, Any],
+) -> dict[str, Any]:
+    # arrays are replaced as a whole by a JSON merge patch
+    web_configs = config["stageConfig"][stage]["ecs"]["web"]
+    if isinstance(web_configs, dict):
+        web_configs = {
+            key: recommended_web_config[key]
+            for key in ["cpu", "memory", "autoScaling"]
+        }
+    else:
+        web_configs = [
+            (
+                recommended_web_config
+                if web_config.get("serviceName", "web") == service_name
+                else web_config
+            )
+            for web_config in web_configs
+        ]
+    return {"stageConfig": {stage: {"ecs": {"web": web_configs}}}}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m cdk_ecs_application.advisor",
+        description="Recommend Fargate task size and auto scaling settings "
+        "from exported CloudWatch metrics.",
+    )
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--stage", required=True)
+    parser.add_argument("--service", default="web")
+    parser.add_argument(
+        "--cpu", required=True, help="ECS CPUUtilization of the service"
+    )
+    parser.add_argument(
+        "--memory", required=True, help="ECS MemoryUtilization of the service"
+    )
+    parser.add_argument(
+        "--task-count", help="Container Insights RunningTaskCount"
+    )
+    parser.add_argument("--request-count", help="ALB RequestCount")
+    parser.add_argument("--latency", help="ALB TargetResponseTime")
+    parser.add_argument("--latency-slo-ms", type=float)
+    parser.add_argument("--min-tasks", type=int, default=1)
+    parser.add_argument("--max-tasks", type=int, default=10)
+    parser.add_argument("--output", help="file to write the config patch")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as fp:
+        config = json.load(fp)
+
+    recommended_web_config, notes = advise(
+        _find_web_config(config["stageConfig"][args.stage], args.service),
+        cpu_utilization=load_metric(args.cpu),
+        memory_utilization=load_metric(args.memory),
+        task_count=args.task_count and load_metric(args.task_count),
+        request_count=args.request_count and load_metric(args.request_count),
+        latency=args.latency and load_metric(args.latency),
+        latency_slo_ms=args.latency_slo_ms,
+        min_tasks=args.min_tasks,
+        max_tasks=args.max_tasks,
+    )
+    for note in notes:
+        print(note, file=sys.stderr)
+
+    patch = json.dumps(
+        build_patch(
+            config,
+            stage=args.stage,
+            service_name=args.service,
+            recommended_web_config=recommended_web_config,
+        ),
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(patch + "\n")
+    else:
+        print(patch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
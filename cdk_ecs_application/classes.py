@@ -6,3 +6,8 @@ class DeployStep(Enum):
     DEV = "DEV"
     STG = "STG"
     PRD = "PRD"
+
+
+class StorageType(Enum):
+    STANDARD = "aurora"
+    IO_OPTIMIZED = "aurora-iopt1"
@@ -1,29 +1,77 @@
+import os
+
 from aws_cdk import (
+    Duration,
+    RemovalPolicy,
+    Stack,
     aws_applicationautoscaling as appscaling,
     aws_certificatemanager as acm,
     aws_cloudwatch as cw,
     aws_cloudwatch_actions as cw_actions,
+    aws_dynamodb as dynamodb,
     aws_ec2 as ec2,
     aws_ecs as ecs,
     aws_ecs_patterns as ecs_patterns,
+    aws_elasticloadbalancingv2 as elbv2,
+    aws_events as events,
+    aws_events_targets as events_targets,
+    aws_iam as iam,
     aws_kms as kms,
+    aws_lambda as lambda_,
     aws_logs as logs,
     aws_rds as rds,
     aws_secretsmanager as secretsmanager,
     aws_sns as sns,
+    aws_stepfunctions as sfn,
+    aws_stepfunctions_tasks as sfn_tasks,
 )
 from constructs import Construct
 
+from .presets import AURORA_PARAMETER_PRESETS, DEFAULT_AURORA_PARAMETERS
 from .structs import (
     AuroraConfig,
     DatabaseConfig,
+    MaintenanceConfig,
     ServerlessConfig,
+    SidecarConfig,
     TaskConfig,
     WebConfig,
 )
 from .utils import get_instance_memory_mib
 
 
+def _task_secrets(
+    task_config: TaskConfig,
+    db_secret: secretsmanager.Secret,
+    db_secret_keys: list[str] | None = None,
+) -> dict[str, ecs.Secret]:
+    return {
+        **{
+            key: ecs.Secret.from_secrets_manager(
+                task_config.secret,
+                key,
+            )
+            for key in task_config.secret_keys
+        },
+        **{
+            f"RDS_{key.upper()}": ecs.Secret.from_secrets_manager(
+                db_secret,
+                key,
+            )
+            for key in (
+                db_secret_keys
+                or [
+                    "host",
+                    "port",
+                    "username",
+                    "password",
+                    "dbname",
+                ]
+            )
+        },
+    }
+
+
 class EcsWebService(Construct):
     def __init__(
         self,
@@ -32,83 +80,77 @@ class EcsWebService(Construct):
         cluster: ecs.Cluster,
         web_config: WebConfig,
         db_secret: secretsmanager.Secret,
+        db_host: str | None = None,
+        listener: elbv2.ApplicationListener | None = None,
         alarm_destination_topic: sns.Topic | None = None,
     ) -> None:
         super().__init__(scope, id)
 
-        self.loadbalanced_service = ecs_patterns.ApplicationLoadBalancedFargateService(  # noqa
-            self,
-            "LoadbalancedService",
-            cluster=cluster,
-            circuit_breaker=ecs.DeploymentCircuitBreaker(rollback=True),
-            capacity_provider_strategies=(
-                [
-                    ecs.CapacityProviderStrategy(
-                        capacity_provider="FARGATE_SPOT",
-                        weight=1,
-                    )
-                ]
-                if web_config.use_spot
-                else None
-            ),
-            cpu=web_config.task_config.cpu,
-            memory_limit_mib=web_config.task_config.memory,
-            task_image_options=ecs_patterns.ApplicationLoadBalancedTaskImageOptions(  # noqa
-                image=ecs.ContainerImage.from_ecr_repository(
-                    repository=web_config.task_config.repository,
-                    tag=web_config.task_config.tag,
-                ),
-                container_name=web_config.task_config.container_name,
-                container_port=web_config.task_config.container_port,
-                command=web_config.task_config.command,
-                enable_logging=True,
-                log_driver=ecs.LogDriver.aws_logs(stream_prefix="web"),
-                secrets={
-                    **{
-                        key: ecs.Secret.from_secrets_manager(
-                            web_config.task_config.secret,
-                            key,
-                        )
-                        for key in web_config.task_config.secret_keys
-                    },
-                    **{
-                        f"RDS_{key.upper()}": ecs.Secret.from_secrets_manager(
-                            db_secret,
-                            key,
-                        )
-                        for key in [
-                            "host",
-                            "port",
-                            "username",
-                            "password",
-                            "dbname",
-                        ]
-                    },
-                },
-            ),
-            certificate=(
-                web_config.https_config
-                and acm.Certificate.from_certificate_arn(
-                    self,
-                    "Certificate",
-                    certificate_arn=web_config.https_config.certificate_arn,
+        capacity_provider_strategies = (
+            [
+                ecs.CapacityProviderStrategy(
+                    capacity_provider="FARGATE_SPOT",
+                    weight=1,
                 )
-            ),
-            ssl_policy=(
-                web_config.https_config and web_config.https_config.ssl_policy
-            ),
-            redirect_http=(
-                web_config.https_config
-                and web_config.https_config.redirect_http
-            ),
+            ]
+            if web_config.use_spot
+            else None
         )
 
+        self.task_definition = self._add_task_definition(
+            web_config=web_config,
+            db_secret=db_secret,
+            db_host=db_host,
+        )
+
+        if listener:
+            self.loadbalanced_service = None
+            self.listener = listener
+            self.service = ecs.FargateService(
+                self,
+                "Service",
+                cluster=cluster,
+                task_definition=self.task_definition,
+                circuit_breaker=ecs.DeploymentCircuitBreaker(rollback=True),
+                capacity_provider_strategies=capacity_provider_strategies,
+            )
+            self._add_listener_targets(web_config)
+        else:
+            self.loadbalanced_service = ecs_patterns.ApplicationLoadBalancedFargateService(  # noqa
+                self,
+                "LoadbalancedService",
+                cluster=cluster,
+                circuit_breaker=ecs.DeploymentCircuitBreaker(rollback=True),
+                capacity_provider_strategies=capacity_provider_strategies,
+                task_definition=self.task_definition,
+                certificate=(
+                    web_config.https_config
+                    and acm.Certificate.from_certificate_arn(
+                        self,
+                        "Certificate",
+                        certificate_arn=web_config.https_config.certificate_arn,  # noqa
+                    )
+                ),
+                ssl_policy=(
+                    web_config.https_config
+                    and web_config.https_config.ssl_policy
+                ),
+                redirect_http=(
+                    web_config.https_config
+                    and web_config.https_config.redirect_http
+                ),
+            )
+            self.listener = self.loadbalanced_service.listener
+            self.service = self.loadbalanced_service.service
+
+        self.service_connect_config = web_config.service_connect_config
+        if self.service_connect_config:
+            self._enable_service_connect(web_config)
+
         if web_config.auto_scaling_config:
-            scalable_target = (
-                self.loadbalanced_service.service.auto_scale_task_count(
-                    min_capacity=web_config.auto_scaling_config.min_capacity,
-                    max_capacity=web_config.auto_scaling_config.max_capacity,
-                )
+            scalable_target = self.service.auto_scale_task_count(
+                min_capacity=web_config.auto_scaling_config.min_capacity,
+                max_capacity=web_config.auto_scaling_config.max_capacity,
             )
             scalable_target.scale_on_cpu_utilization(
                 "CpuScaling",
@@ -118,15 +160,327 @@ class EcsWebService(Construct):
                 "MemoryScaling",
                 target_utilization_percent=web_config.auto_scaling_config.memory_percent,  # noqa
             )
+            self._add_custom_metric_scaling(
+                scalable_target,
+                web_config=web_config,
+            )
 
         if alarm_destination_topic:
             self._add_alarm(alarm_destination_topic)
 
+    def _add_task_definition(
+        self,
+        web_config: WebConfig,
+        db_secret: secretsmanager.Secret,
+        db_host: str | None = None,
+    ) -> ecs.FargateTaskDefinition:
+        task_definition = ecs.FargateTaskDefinition(
+            self,
+            "TaskDefinition",
+            cpu=web_config.task_config.cpu,
+            memory_limit_mib=web_config.task_config.memory,
+        )
+        task_config = web_config.task_config
+        ingress_port_mapping = ecs.PortMapping(
+            container_port=(
+                task_config.ingress_sidecar_configs[0].container_port
+                if task_config.ingress_sidecar_configs
+                else task_config.container_port
+            ),
+            name=web_config.service_name,
+            app_protocol=(
+                web_config.service_connect_config
+                and web_config.service_connect_config.app_protocol
+            ),
+        )
+
+        # the first container added becomes the load balancer target
+        containers: dict[str, ecs.ContainerDefinition] = {}
+        for sidecar_config in task_config.ingress_sidecar_configs:
+            containers[sidecar_config.container_name] = self._add_sidecar(
+                task_definition,
+                sidecar_config=sidecar_config,
+                port_mapping=ingress_port_mapping,
+                stream_prefix=web_config.service_name,
+            )
+        containers[task_config.container_name] = task_definition.add_container(
+            "Container",
+            container_name=task_config.container_name,
+            image=ecs.ContainerImage.from_ecr_repository(
+                repository=task_config.repository,
+                tag=task_config.tag,
+            ),
+            command=task_config.command,
+            port_mappings=[
+                (
+                    ecs.PortMapping(container_port=task_config.container_port)
+                    if task_config.ingress_sidecar_configs
+                    else ingress_port_mapping
+                ),
+            ],
+            health_check=task_config.health_check,
+            logging=ecs.LogDriver.aws_logs(
+                stream_prefix=web_config.service_name,
+            ),
+            environment=self._container_environment(web_config, db_host),
+            secrets=_task_secrets(
+                task_config,
+                db_secret,
+                db_secret_keys=db_host
+                and ["port", "username", "password", "dbname"],
+            ),
+        )
+        for sidecar_config in task_config.sidecar_configs:
+            if sidecar_config.ingress:
+                continue
+            containers[sidecar_config.container_name] = self._add_sidecar(
+                task_definition,
+                sidecar_config=sidecar_config,
+                port_mapping=(
+                    sidecar_config.container_port
+                    and ecs.PortMapping(
+                        container_port=sidecar_config.container_port
+                    )
+                ),
+                stream_prefix=web_config.service_name,
+            )
+
+        for sidecar_config in task_config.sidecar_configs:
+            container = containers[sidecar_config.container_name]
+            for name, condition in sidecar_config.depends_on.items():
+                container.add_container_dependencies(
+                    ecs.ContainerDependency(
+                        container=containers[name],
+                        condition=condition,
+                    )
+                )
+
+        auto_scaling_config = web_config.auto_scaling_config
+        if auto_scaling_config and auto_scaling_config.custom_metric_configs:
+            # EMF is extracted from the awslogs stream, the permission is for
+            # applications publishing through the CloudWatch API or agent
+            task_definition.add_to_task_role_policy(
+                iam.PolicyStatement(
+                    actions=["cloudwatch:PutMetricData"],
+                    resources=["*"],
+                    conditions={
+                        "StringEquals": {
+                            "cloudwatch:namespace": auto_scaling_config.metric_namespace,  # noqa
+                        },
+                    },
+                )
+            )
+
+        return task_definition
+
+    def _container_environment(
+        self, web_config: WebConfig, db_host: str | None = None
+    ) -> dict[str, str] | None:
+        environment: dict[str, str] = {}
+        # the given host (e.g. a local reader endpoint) takes the place
+        # of the host in the database secret
+        if db_host:
+            environment["RDS_HOST"] = db_host
+
+        auto_scaling_config = web_config.auto_scaling_config
+        if auto_scaling_config and auto_scaling_config.custom_metric_configs:
+            # read by the aws-embedded-metrics libraries, "Local" writes EMF
+            # to stdout so that it is shipped by the awslogs driver
+            emf_dimensions = web_config.emf_dimensions(
+                Stack.of(self).stack_name
+            )
+            environment.update(
+                {
+                    "AWS_EMF_NAMESPACE": auto_scaling_config.metric_namespace,
+                    "AWS_EMF_ENVIRONMENT": "Local",
+                    "AWS_EMF_LOG_GROUP_NAME": emf_dimensions["LogGroup"],
+                    "AWS_EMF_SERVICE_NAME": emf_dimensions["ServiceName"],
+                    "AWS_EMF_SERVICE_TYPE": emf_dimensions["ServiceType"],
+                }
+            )
+
+        return environment or None
+
+    def _add_custom_metric_scaling(
+        self,
+        scalable_target: ecs.ScalableTaskCount,
+        web_config: WebConfig,
+    ) -> None:
+        auto_scaling_config = web_config.auto_scaling_config
+        for custom_metric_config in auto_scaling_config.custom_metric_configs:
+            dimensions = (
+                custom_metric_config.dimensions
+                or web_config.emf_dimensions(Stack.of(self).stack_name)
+            )
+            metric = cw.Metric(
+                namespace=auto_scaling_config.metric_namespace,
+                metric_name=custom_metric_config.metric_name,
+                dimensions_map=dimensions,
+                statistic=custom_metric_config.statistic,
+                period=custom_metric_config.period,
+            )
+            if custom_metric_config.target_value is not None:
+                scalable_target.scale_to_track_custom_metric(
+                    f"{custom_metric_config.metric_name}Scaling",
+                    metric=metric,
+                    target_value=custom_metric_config.target_value,
+                )
+            else:
+                scalable_target.scale_on_metric(
+                    f"{custom_metric_config.metric_name}Scaling",
+                    metric=metric,
+                    scaling_steps=custom_metric_config.scaling_steps,
+                    adjustment_type=appscaling.AdjustmentType.CHANGE_IN_CAPACITY,  # noqa
+                )
+
+    def _add_sidecar(
+        self,
+        task_definition: ecs.FargateTaskDefinition,
+        sidecar_config: SidecarConfig,
+        port_mapping: ecs.PortMapping | None,
+        stream_prefix: str,
+    ) -> ecs.ContainerDefinition:
+        return task_definition.add_container(
+            f"Sidecar-{sidecar_config.container_name}",
+            container_name=sidecar_config.container_name,
+            image=sidecar_config.image,
+            cpu=sidecar_config.cpu,
+            memory_limit_mib=sidecar_config.memory,
+            essential=sidecar_config.essential,
+            command=sidecar_config.command,
+            environment=sidecar_config.environment,
+            port_mappings=port_mapping and [port_mapping],
+            health_check=sidecar_config.health_check,
+            logging=ecs.LogDriver.aws_logs(
+                stream_prefix=f"{stream_prefix}-{sidecar_config.container_name}",  # noqa
+            ),
+        )
+
+    def _add_listener_targets(self, web_config: WebConfig) -> None:
+        routing_config = web_config.routing_config
+        self.listener.add_targets(
+            web_config.service_name,
+            priority=routing_config.priority,
+            conditions=[
+                *(
+                    [
+                        elbv2.ListenerCondition.path_patterns(
+                            routing_config.path_patterns
+                        )
+                    ]
+                    if routing_config.path_patterns
+                    else []
+                ),
+                *(
+                    [
+                        elbv2.ListenerCondition.host_headers(
+                            routing_config.host_headers
+                        )
+                    ]
+                    if routing_config.host_headers
+                    else []
+                ),
+            ],
+            protocol=elbv2.ApplicationProtocol.HTTP,
+            targets=[self.service],
+        )
+
+    def _enable_service_connect(self, web_config: WebConfig) -> None:
+        service_connect_config = web_config.service_connect_config
+        self.service.enable_service_connect(
+            services=[
+                ecs.ServiceConnectService(
+                    port_mapping_name=web_config.service_name,
+                    discovery_name=service_connect_config.discovery_name,
+                    dns_name=service_connect_config.dns_name,
+                    port=service_connect_config.port,
+                ),
+            ],
+            log_driver=ecs.LogDriver.aws_logs(
+                stream_prefix=f"{web_config.service_name}-service-connect",
+            ),
+        )
+
+        # timeouts are not supported by the L2 construct yet
+        timeout = {
+            **(
+                {
+                    "IdleTimeoutSeconds": service_connect_config.idle_timeout.to_seconds()  # noqa
+                }
+                if service_connect_config.idle_timeout
+                else {}
+            ),
+            **(
+                {
+                    "PerRequestTimeoutSeconds": service_connect_config.per_request_timeout.to_seconds()  # noqa
+                }
+                if service_connect_config.per_request_timeout
+                else {}
+            ),
+        }
+        if timeout:
+            cfn_service: ecs.CfnService = self.service.node.default_child
+            cfn_service.add_property_override(
+                "ServiceConnectConfiguration.Services.0.Timeout",
+                timeout,
+            )
+
+    def metric_service_connect(
+        self,
+        metric_name: str,
+        statistic: str = cw.Stats.SUM,
+    ) -> cw.Metric:
+        return cw.Metric(
+            namespace="AWS/ECS",
+            metric_name=metric_name,
+            dimensions_map={
+                "ClusterName": self.service.cluster.cluster_name,
+                "ServiceName": self.service.service_name,
+                "DiscoveryName": self.service_connect_config.discovery_name,
+            },
+            statistic=statistic,
+        )
+
+    def service_connect_widgets(self) -> list[cw.IWidget]:
+        if not self.service_connect_config:
+            return []
+
+        service_name = self.service_connect_config.discovery_name
+        return [
+            cw.GraphWidget(
+                title=f"{service_name} requests",
+                left=[
+                    self.metric_service_connect("RequestCount"),
+                    self.metric_service_connect("HTTPCode_Target_5XX_Count"),
+                ],
+            ),
+            cw.GraphWidget(
+                title=f"{service_name} response time",
+                left=[
+                    self.metric_service_connect(
+                        "TargetResponseTime", statistic=cw.Stats.p(50)
+                    ),
+                    self.metric_service_connect(
+                        "TargetResponseTime", statistic=cw.Stats.p(99)
+                    ),
+                ],
+            ),
+            cw.GraphWidget(
+                title=f"{service_name} connections",
+                left=[
+                    self.metric_service_connect("NewConnectionCount"),
+                    self.metric_service_connect(
+                        "ActiveConnectionCount", statistic=cw.Stats.AVERAGE
+                    ),
+                ],
+            ),
+        ]
+
     def _add_alarm(self, topic: sns.Topic) -> None:
         cpu_alarm = cw.Alarm(
             self,
             "CpuUtilizationAlarm",
-            metric=self.loadbalanced_service.service.metric_cpu_utilization(),
+            metric=self.service.metric_cpu_utilization(),
             evaluation_periods=5,
             datapoints_to_alarm=3,
             threshold=90,
@@ -139,7 +493,7 @@ class EcsWebService(Construct):
         memory_alarm = cw.Alarm(
             self,
             "MemoryUtilizationAlarm",
-            metric=self.loadbalanced_service.service.metric_memory_utilization(),  # noqa
+            metric=self.service.metric_memory_utilization(),  # noqa
             evaluation_periods=5,
             datapoints_to_alarm=3,
             threshold=90,
@@ -159,14 +513,18 @@ class EcsBatchTask(Construct):
         task_config: TaskConfig,
         schedule: appscaling.Schedule,
         db_secret: secretsmanager.Secret,
+        db_resume_function: lambda_.IFunction | None = None,
         alarm_destination_topic: sns.Topic | None = None,
     ) -> None:
         super().__init__(scope, id)
 
+        # with a database to resume, the task is run by a state machine
+        # which waits for the database instead of the rule of the pattern
         self.scheduled_task = ecs_patterns.ScheduledFargateTask(
             self,
             "ScheduledTask",
             cluster=cluster,
+            enabled=db_resume_function is None,
             cpu=task_config.cpu,
             memory_limit_mib=task_config.memory,
             scheduled_fargate_task_image_options=ecs_patterns.ScheduledFargateTaskImageOptions(  # noqa
@@ -174,36 +532,69 @@ class EcsBatchTask(Construct):
                     repository=task_config.repository,
                     tag=task_config.tag,
                 ),
-                secrets={
-                    **{
-                        key: ecs.Secret.from_secrets_manager(
-                            task_config.secret,
-                            key,
-                        )
-                        for key in task_config.secret_keys
-                    },
-                    **{
-                        f"RDS_{key.upper()}": ecs.Secret.from_secrets_manager(
-                            db_secret,
-                            key,
-                        )
-                        for key in [
-                            "host",
-                            "port",
-                            "username",
-                            "password",
-                            "dbname",
-                        ]
-                    },
-                },
+                secrets=_task_secrets(task_config, db_secret),
                 log_driver=ecs.LogDriver.aws_logs(stream_prefix="batch"),
             ),
             schedule=schedule,
         )
 
+        self.event_rule = self.scheduled_task.event_rule
+        self.state_machine = None
+        if db_resume_function:
+            self.state_machine = self._add_state_machine(
+                cluster,
+                db_resume_function=db_resume_function,
+            )
+            expression = schedule.expression_string
+            self.event_rule = events.Rule(
+                self,
+                "Rule",
+                schedule=events.Schedule.expression(expression),
+                targets=[events_targets.SfnStateMachine(self.state_machine)],
+            )
+
         if alarm_destination_topic:
             self._add_alarm(alarm_destination_topic)
 
+    def _add_state_machine(
+        self,
+        cluster: ecs.Cluster,
+        db_resume_function: lambda_.IFunction,
+    ) -> sfn.StateMachine:
+        resume_database = sfn_tasks.LambdaInvoke(
+            self,
+            "ResumeDatabase",
+            lambda_function=db_resume_function,
+            payload_response_only=True,
+            result_path="$.database",
+        )
+        run_task = sfn_tasks.EcsRunTask(
+            self,
+            "RunTask",
+            cluster=cluster,
+            task_definition=self.scheduled_task.task_definition,
+            launch_target=sfn_tasks.EcsFargateLaunchTarget(
+                platform_version=ecs.FargatePlatformVersion.LATEST,
+            ),
+            integration_pattern=sfn.IntegrationPattern.REQUEST_RESPONSE,
+        )
+        # the function returns before its timeout while the database is
+        # still resuming, it is invoked again until the database is ready
+        definition = resume_database.next(
+            sfn.Choice(self, "DatabaseAvailable")
+            .when(
+                sfn.Condition.boolean_equals("$.database.available", True),
+                run_task,
+            )
+            .otherwise(resume_database)
+        )
+        return sfn.StateMachine(
+            self,
+            "StateMachine",
+            definition=definition,
+            timeout=Duration.minutes(30),
+        )
+
     def _add_alarm(self, topic: sns.Topic) -> None:
         failed_invocations_alarm = cw.Alarm(
             self,
@@ -212,7 +603,7 @@ class EcsBatchTask(Construct):
                 namespace="AWS/Events",
                 metric_name="FailedInvocations",
                 dimensions_map={
-                    "RuleName": self.scheduled_task.event_rule.rule_name,
+                    "RuleName": self.event_rule.rule_name,
                 },
             ),
             evaluation_periods=1,
@@ -226,6 +617,110 @@ class EcsBatchTask(Construct):
             cw_actions.SnsAction(topic)
         )
 
+        if self.state_machine:
+            failed_executions_alarm = cw.Alarm(
+                self,
+                "FailedExecutionsAlarm",
+                metric=self.state_machine.metric_failed(),
+                evaluation_periods=1,
+                datapoints_to_alarm=1,
+                threshold=1,
+                comparison_operator=cw.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,  # noqa
+            )
+            failed_executions_alarm.add_alarm_action(
+                cw_actions.SnsAction(topic)
+            )
+            failed_executions_alarm.add_ok_action(cw_actions.SnsAction(topic))
+
+
+class TaskStartupMetrics(Construct):
+    namespace = "EcsApplication"
+
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        cluster: ecs.Cluster,
+    ) -> None:
+        super().__init__(scope, id)
+
+        self.cluster = cluster
+        # tasks already reported, RUNNING events repeat on later updates
+        self.table = dynamodb.Table(
+            self,
+            "ReportedTaskTable",
+            partition_key=dynamodb.Attribute(
+                name="taskArn",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            time_to_live_attribute="expiresAt",
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+        self.function = lambda_.Function(
+            self,
+            "Function",
+            runtime=lambda_.Runtime.PYTHON_3_9,
+            handler="index.handler",
+            code=lambda_.Code.from_asset(
+                os.path.join(
+                    os.path.dirname(__file__),
+                    "functions",
+                    "task_startup_metrics",
+                )
+            ),
+            timeout=Duration.seconds(10),
+            environment={
+                "METRIC_NAMESPACE": self.namespace,
+                "REPORTED_TASK_TABLE_NAME": self.table.table_name,
+            },
+            log_retention=logs.RetentionDays.ONE_MONTH,
+        )
+        self.table.grant_write_data(self.function)
+        self.function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["cloudwatch:PutMetricData"],
+                resources=["*"],
+                conditions={
+                    "StringEquals": {
+                        "cloudwatch:namespace": self.namespace,
+                    },
+                },
+            )
+        )
+
+        self.rule = events.Rule(
+            self,
+            "TaskRunningRule",
+            event_pattern=events.EventPattern(
+                source=["aws.ecs"],
+                detail_type=["ECS Task State Change"],
+                detail={
+                    "clusterArn": [cluster.cluster_arn],
+                    "lastStatus": ["RUNNING"],
+                    "desiredStatus": ["RUNNING"],
+                },
+            ),
+            targets=[events_targets.LambdaFunction(self.function)],
+        )
+
+    def metric_task_startup_time(self, task_group: str) -> cw.Metric:
+        return self._metric("TaskStartupTime", task_group)
+
+    def metric_image_pull_time(self, task_group: str) -> cw.Metric:
+        return self._metric("ImagePullTime", task_group)
+
+    def _metric(self, metric_name: str, task_group: str) -> cw.Metric:
+        return cw.Metric(
+            namespace=self.namespace,
+            metric_name=metric_name,
+            dimensions_map={
+                "ClusterName": self.cluster.cluster_name,
+                "TaskGroup": task_group,
+            },
+            statistic=cw.Stats.AVERAGE,
+        )
+
 
 class RdsCluster(Construct):
     def __init__(
@@ -237,6 +732,9 @@ class RdsCluster(Construct):
     ) -> None:
         super().__init__(scope, id)
 
+        # resumes the cluster when it is paused, set by auto-pausing clusters
+        self.resume_function: lambda_.Function | None = None
+
         self.security_group = ec2.SecurityGroup(
             self,
             "SecurityGroup",
@@ -251,22 +749,21 @@ class RdsCluster(Construct):
         self.engine = rds.DatabaseClusterEngine.aurora_mysql(
             version=aurora_config.engine_version
         )
-        parameters = aurora_config.parameters.copy()
-        [
-            parameters.setdefault(key, value)
-            for key, value in {
-                "server_audit_logging": "1",
-                "server_audit_logs_upload": "1",
-                "general_log": "1",
-                "slow_query_log": "1",
-                "long_query_time": "3",
-            }.items()
-        ]
+        self.preset = AURORA_PARAMETER_PRESETS.get(aurora_config.preset, {})
         self.parameter_group = rds.ParameterGroup(
             self,
             "ParameterGroup",
             engine=self.engine,
-            parameters=aurora_config.parameters,
+            parameters={
+                **DEFAULT_AURORA_PARAMETERS,
+                **self.preset.get("cluster", {}),
+                **(
+                    {"aurora_parallel_query": "ON"}
+                    if aurora_config.parallel_query
+                    else {}
+                ),
+                **aurora_config.parameters,
+            },
         )
 
         self.key = kms.Key(
@@ -274,6 +771,23 @@ class RdsCluster(Construct):
             "Key",
         )
 
+    def _add_instance_parameter_group(
+        self, aurora_config: AuroraConfig
+    ) -> rds.ParameterGroup | None:
+        instance_parameters = {
+            **self.preset.get("instance", {}),
+            **aurora_config.instance_parameters,
+        }
+        if not instance_parameters:
+            return None
+
+        return rds.ParameterGroup(
+            self,
+            "InstanceParameterGroup",
+            engine=self.engine,
+            parameters=instance_parameters,
+        )
+
 
 class AuroraServerless(RdsCluster):
     def __init__(
@@ -283,6 +797,8 @@ class AuroraServerless(RdsCluster):
         vpc: ec2.Vpc,
         aurora_config: AuroraConfig,
         serverless_config: ServerlessConfig,
+        vpc_subnets: ec2.SubnetSelection | None = None,
+        maintenance_config: MaintenanceConfig | None = None,
         alarm_destination_topic: sns.Topic | None = None,
     ) -> None:
         super().__init__(scope, id, vpc=vpc, aurora_config=aurora_config)
@@ -291,6 +807,7 @@ class AuroraServerless(RdsCluster):
             self,
             "Cluster",
             vpc=vpc,
+            vpc_subnets=vpc_subnets,
             security_groups=[self.security_group],
             engine=self.engine,
             parameter_group=self.parameter_group,
@@ -299,13 +816,119 @@ class AuroraServerless(RdsCluster):
                 min_capacity=serverless_config.min_capacity,
                 max_capacity=serverless_config.max_capacity,
             ),
+            backup_retention=(
+                maintenance_config and maintenance_config.backup_retention
+            ),
             storage_encryption_key=self.key,
             default_database_name=aurora_config.database_name,
         )
 
+        # preferred windows are not supported by the L2 construct
+        cfn_cluster: rds.CfnDBCluster = self.cluster.node.default_child
+        if maintenance_config and maintenance_config.preferred_backup_window:
+            cfn_cluster.add_property_override(
+                "PreferredBackupWindow",
+                maintenance_config.preferred_backup_window,
+            )
+        if (
+            maintenance_config
+            and maintenance_config.preferred_maintenance_window
+        ):
+            cfn_cluster.add_property_override(
+                "PreferredMaintenanceWindow",
+                maintenance_config.preferred_maintenance_window,
+            )
+
+        self.serverless_config = serverless_config
+        if serverless_config.auto_pause:
+            self.resume_function = self._add_resume_function(serverless_config)
+        for number, warm_window_config in enumerate(
+            serverless_config.warm_window_configs, 1
+        ):
+            events.Rule(
+                self,
+                f"WarmWindowStart{number}",
+                schedule=warm_window_config.start,
+                targets=[
+                    events_targets.LambdaFunction(
+                        self.resume_function,
+                        event=events.RuleTargetInput.from_object(
+                            {"autoPause": False}
+                        ),
+                    ),
+                ],
+            )
+            events.Rule(
+                self,
+                f"WarmWindowEnd{number}",
+                schedule=warm_window_config.end,
+                targets=[
+                    self._enable_auto_pause_target(serverless_config),
+                ],
+            )
+
         if alarm_destination_topic:
             self._add_alarm(alarm_destination_topic)
 
+    def _add_resume_function(
+        self, serverless_config: ServerlessConfig
+    ) -> lambda_.Function:
+        function = lambda_.Function(
+            self,
+            "ResumeFunction",
+            runtime=lambda_.Runtime.PYTHON_3_9,
+            handler="index.handler",
+            code=lambda_.Code.from_asset(
+                os.path.join(
+                    os.path.dirname(__file__),
+                    "functions",
+                    "resume_serverless_cluster",
+                )
+            ),
+            timeout=Duration.minutes(5),
+            environment={
+                "CLUSTER_IDENTIFIER": self.cluster.cluster_identifier,
+                # AuroraCapacityUnit values are like "ACU_2"
+                "MIN_CAPACITY": serverless_config.min_capacity.value[4:],
+                "SECONDS_UNTIL_AUTO_PAUSE": str(
+                    int(serverless_config.auto_pause.to_seconds())
+                ),
+            },
+            log_retention=logs.RetentionDays.ONE_MONTH,
+        )
+        function.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "rds:DescribeDBClusters",
+                    "rds:ModifyCurrentDBClusterCapacity",
+                    "rds:ModifyDBCluster",
+                ],
+                resources=[self.cluster.cluster_arn],
+            )
+        )
+        return function
+
+    def _enable_auto_pause_target(
+        self, serverless_config: ServerlessConfig
+    ) -> events.IRuleTarget:
+        return events_targets.AwsApi(
+            service="RDS",
+            action="modifyDBCluster",
+            parameters={
+                "DBClusterIdentifier": self.cluster.cluster_identifier,
+                "ScalingConfiguration": {
+                    "AutoPause": True,
+                    "SecondsUntilAutoPause": int(
+                        serverless_config.auto_pause.to_seconds()
+                    ),
+                },
+            },
+            policy_statement=iam.PolicyStatement(
+                actions=["rds:ModifyDBCluster"],
+                resources=[self.cluster.cluster_arn],
+            ),
+        )
+
     def _add_alarm(self, topic: sns.Topic) -> None:
         pass
 
@@ -318,10 +941,16 @@ class AuroraDatabase(RdsCluster):
         vpc: ec2.Vpc,
         aurora_config: AuroraConfig,
         database_config: DatabaseConfig,
+        vpc_subnets: ec2.SubnetSelection | None = None,
+        maintenance_config: MaintenanceConfig | None = None,
         alarm_destination_topic: sns.Topic | None = None,
     ) -> None:
         super().__init__(scope, id, vpc=vpc, aurora_config=aurora_config)
 
+        self.instance_parameter_group = self._add_instance_parameter_group(
+            aurora_config
+        )
+
         self.cluster = rds.DatabaseCluster(
             self,
             "Cluster",
@@ -329,7 +958,9 @@ class AuroraDatabase(RdsCluster):
             instance_props=rds.InstanceProps(
                 instance_type=database_config.instance_type,
                 vpc=vpc,
+                vpc_subnets=vpc_subnets,
                 security_groups=[self.security_group],
+                parameter_group=self.instance_parameter_group,
                 allow_major_version_upgrade=False,
                 auto_minor_version_upgrade=False,
             ),
@@ -342,11 +973,29 @@ class AuroraDatabase(RdsCluster):
                 "audit",
             ],
             cloudwatch_logs_retention=logs.RetentionDays.ONE_MONTH,
+            backup=(
+                maintenance_config
+                and rds.BackupProps(
+                    retention=maintenance_config.backup_retention,
+                    preferred_window=maintenance_config.preferred_backup_window,  # noqa
+                )
+            ),
+            preferred_maintenance_window=(
+                maintenance_config
+                and maintenance_config.preferred_maintenance_window
+            ),
             parameter_group=self.parameter_group,
             storage_encryption_key=self.key,
             default_database_name=aurora_config.database_name,
         )
 
+        # storage type is not supported by the L2 construct yet
+        cfn_cluster: rds.CfnDBCluster = self.cluster.node.default_child
+        cfn_cluster.add_property_override(
+            "StorageType",
+            database_config.storage_type.value,
+        )
+
         if alarm_destination_topic:
             self._add_alarm(
                 alarm_destination_topic,
@@ -383,3 +1032,68 @@ class AuroraDatabase(RdsCluster):
         memory_alarm.add_alarm_action(cw_actions.SnsAction(topic))
         memory_alarm.add_ok_action(cw_actions.SnsAction(topic))
         memory_alarm.add_insufficient_data_action(cw_actions.SnsAction(topic))
+
+
+class AuroraGlobalSecondary(RdsCluster):
+    def __init__(
+        self,
+        scope: Construct,
+        id: str,
+        vpc: ec2.Vpc,
+        aurora_config: AuroraConfig,
+        database_config: DatabaseConfig,
+        global_cluster_identifier: str,
+        vpc_subnets: ec2.SubnetSelection | None = None,
+    ) -> None:
+        super().__init__(scope, id, vpc=vpc, aurora_config=aurora_config)
+
+        self.instance_parameter_group = self._add_instance_parameter_group(
+            aurora_config
+        )
+        self.subnet_group = rds.SubnetGroup(
+            self,
+            "SubnetGroup",
+            vpc=vpc,
+            vpc_subnets=vpc_subnets,
+            description=f"Subnets for {id} database",
+        )
+
+        # global database clusters are not supported by the L2 construct
+        self.cluster = rds.CfnDBCluster(
+            self,
+            "Cluster",
+            engine=self.engine.engine_type,
+            engine_version=self.engine.engine_version.full_version,
+            global_cluster_identifier=global_cluster_identifier,
+            db_cluster_parameter_group_name=(
+                self.parameter_group.bind_to_cluster().parameter_group_name
+            ),
+            db_subnet_group_name=self.subnet_group.subnet_group_name,
+            vpc_security_group_ids=[self.security_group.security_group_id],
+            storage_encrypted=True,
+            kms_key_id=self.key.key_arn,
+            storage_type=database_config.storage_type.value,
+        )
+        instance_parameter_group_name = (
+            self.instance_parameter_group
+            and self.instance_parameter_group.bind_to_instance().parameter_group_name  # noqa
+        )
+        self.instances = [
+            rds.CfnDBInstance(
+                self,
+                f"Instance{number}",
+                db_cluster_identifier=self.cluster.ref,
+                engine=self.engine.engine_type,
+                db_instance_class=(
+                    f"db.{database_config.instance_type.to_string()}"
+                ),
+                db_parameter_group_name=instance_parameter_group_name,
+                db_subnet_group_name=self.subnet_group.subnet_group_name,
+                auto_minor_version_upgrade=False,
+            )
+            for number in range(1, database_config.instances + 1)
+        ]
+
+    @property
+    def reader_endpoint(self) -> str:
+        return self.cluster.attr_read_endpoint_address
@@ -0,0 +1,50 @@
+import os
+import time
+
+import boto3
+
+POLL_INTERVAL_SECONDS = 10
+
+rds = boto3.client("rds")
+
+
+def _describe_cluster() -> dict:
+    response = rds.describe_db_clusters(
+        DBClusterIdentifier=os.environ["CLUSTER_IDENTIFIER"],
+    )
+    return response["DBClusters"][0]
+
+
+def handler(event, context):
+    if "autoPause" in event:
+        rds.modify_db_cluster(
+            DBClusterIdentifier=os.environ["CLUSTER_IDENTIFIER"],
+            ScalingConfiguration={
+                "AutoPause": event["autoPause"],
+                "SecondsUntilAutoPause": int(
+                    os.environ["SECONDS_UNTIL_AUTO_PAUSE"]
+                ),
+            },
+        )
+
+    resumed = False
+    while True:
+        cluster = _describe_cluster()
+        if cluster["Status"] == "available":
+            if cluster["Capacity"] > 0:
+                return {"available": True}
+            # only a paused cluster is resumed, a running cluster may have
+            # scaled above the minimum capacity
+            if not resumed:
+                rds.modify_current_db_cluster_capacity(
+                    DBClusterIdentifier=os.environ["CLUSTER_IDENTIFIER"],
+                    Capacity=int(os.environ["MIN_CAPACITY"]),
+                )
+                resumed = True
+
+        if (
+            context.get_remaining_time_in_millis()
+            < (POLL_INTERVAL_SECONDS + 5) * 1000
+        ):
+            return {"available": False}
+        time.sleep(POLL_INTERVAL_SECONDS)
@@ -0,0 +1,81 @@
+import os
+import time
+from datetime import datetime
+
+import boto3
+
+# reported tasks are kept a little longer than events may be retried
+REPORTED_TASK_TTL_SECONDS = 24 * 60 * 60
+
+cloudwatch = boto3.client("cloudwatch")
+dynamodb = boto3.client("dynamodb")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _elapsed_seconds(detail: dict, start_key: str, end_key: str) -> float:
+    return (
+        _parse_timestamp(detail[end_key]) - _parse_timestamp(detail[start_key])
+    ).total_seconds()
+
+
+def _mark_reported(task_arn: str) -> bool:
+    try:
+        dynamodb.put_item(
+            TableName=os.environ["REPORTED_TASK_TABLE_NAME"],
+            Item={
+                "taskArn": {"S": task_arn},
+                "expiresAt": {
+                    "N": str(int(time.time()) + REPORTED_TASK_TTL_SECONDS)
+                },
+            },
+            ConditionExpression="attribute_not_exists(taskArn)",
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        return False
+    return True
+
+
+def handler(event, context):
+    detail = event["detail"]
+    if "startedAt" not in detail:
+        return
+    if not _mark_reported(detail["taskArn"]):
+        return
+
+    dimensions = [
+        {
+            "Name": "ClusterName",
+            "Value": detail["clusterArn"].split("/")[-1],
+        },
+        {
+            "Name": "TaskGroup",
+            "Value": detail["group"],
+        },
+    ]
+    metric_data = [
+        {
+            "MetricName": "TaskStartupTime",
+            "Dimensions": dimensions,
+            "Value": _elapsed_seconds(detail, "createdAt", "startedAt"),
+            "Unit": "Seconds",
+        },
+    ]
+    if "pullStartedAt" in detail and "pullStoppedAt" in detail:
+        metric_data.append(
+            {
+                "MetricName": "ImagePullTime",
+                "Dimensions": dimensions,
+                "Value": _elapsed_seconds(
+                    detail, "pullStartedAt", "pullStoppedAt"
+                ),
+                "Unit": "Seconds",
+            }
+        )
+
+    cloudwatch.put_metric_data(
+        Namespace=os.environ["METRIC_NAMESPACE"],
+        MetricData=metric_data,
+    )
@@ -0,0 +1,55 @@
+DEFAULT_AURORA_PARAMETERS = {
+    "server_audit_logging": "1",
+    "server_audit_logs_upload": "1",
+    # logging every statement is too heavy to be enabled by default
+    "general_log": "0",
+    "slow_query_log": "1",
+    "long_query_time": "3",
+}
+
+# Memory sized values use parameter group formulas so that a preset scales
+# with the DB instance class it is applied to. Values equal to the Aurora
+# defaults are left out.
+AURORA_PARAMETER_PRESETS = {
+    "oltp": {
+        "cluster": {
+            "general_log": "0",
+            "slow_query_log": "1",
+            "long_query_time": "1",
+            "server_audit_events": "CONNECT,QUERY_DCL,QUERY_DDL",
+            "innodb_print_all_deadlocks": "1",
+        },
+        "instance": {
+            "innodb_lock_wait_timeout": "10",
+            "table_open_cache": "4000",
+            "wait_timeout": "300",
+        },
+    },
+    "reporting": {
+        "cluster": {
+            "general_log": "0",
+            "slow_query_log": "1",
+            "long_query_time": "10",
+            "server_audit_events": "CONNECT,QUERY_DCL,QUERY_DDL",
+        },
+        "instance": {
+            "innodb_buffer_pool_size": "{DBInstanceClassMemory*5/8}",
+            "max_connections": "{DBInstanceClassMemory/50331648}",
+            "tmp_table_size": "268435456",
+            "max_heap_table_size": "268435456",
+            "sort_buffer_size": "4194304",
+            "join_buffer_size": "4194304",
+        },
+    },
+}
+
+# valid memory (MiB) for each Fargate task cpu (units)
+FARGATE_TASK_SIZES = {
+    256: [512, 1024, 2048],
+    512: list(range(1024, 4096 + 1, 1024)),
+    1024: list(range(2048, 8192 + 1, 1024)),
+    2048: list(range(4096, 16384 + 1, 1024)),
+    4096: list(range(8192, 30720 + 1, 1024)),
+    8192: list(range(16384, 61440 + 1, 4096)),
+    16384: list(range(32768, 122880 + 1, 8192)),
+}
@@ -0,0 +1,104 @@
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+
+REQUEST_TIMEOUT_SECONDS = 10
+THRESHOLD_VARIABLES = {
+    "LatencyP50": "MAX_P50_MS",
+    "LatencyP95": "MAX_P95_MS",
+    "LatencyP99": "MAX_P99_MS",
+    "ErrorRate": "MAX_ERROR_RATE_PERCENT",
+}
+
+
+def _request(url: str) -> tuple[float, bool]:
+    started_at = time.perf_counter()
+    try:
+        with urllib.request.urlopen(
+            url, timeout=REQUEST_TIMEOUT_SECONDS
+        ) as response:
+            response.read()
+            succeeded = response.status < 500
+    except urllib.error.HTTPError as e:
+        succeeded = e.code < 500
+    except OSError:
+        succeeded = False
+    return (time.perf_counter() - started_at) * 1000, succeeded
+
+
+def _worker(url: str, deadline: float) -> list[tuple[float, bool]]:
+    results = []
+    while time.perf_counter() < deadline:
+        results.append(_request(url))
+    return results
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    index = max(0, int(round(len(values) * percent / 100)) - 1)
+    return values[index]
+
+
+def main() -> int:
+    url = os.environ["TARGET_URL"]
+    concurrency = int(os.environ["CONCURRENCY"])
+    deadline = time.perf_counter() + int(os.environ["DURATION_SECONDS"])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(_worker, url, deadline) for _ in range(concurrency)
+        ]
+        results = [result for f in futures for result in f.result()]
+
+    if not results:
+        print("no requests were completed")
+        return 1
+
+    latencies = sorted(latency for latency, _ in results)
+    statistics = {
+        "LatencyP50": _percentile(latencies, 50),
+        "LatencyP95": _percentile(latencies, 95),
+        "LatencyP99": _percentile(latencies, 99),
+        "ErrorRate": (
+            sum(1 for _, succeeded in results if not succeeded)
+            / len(results)
+            * 100
+        ),
+    }
+    print(f"requests: {len(results)}")
+    for name, value in statistics.items():
+        print(f"{name}: {value:.2f}")
+
+    boto3.client("cloudwatch").put_metric_data(
+        Namespace=os.environ["METRIC_NAMESPACE"],
+        MetricData=[
+            {
+                "MetricName": name,
+                "Dimensions": [
+                    {
+                        "Name": "PipelineName",
+                        "Value": os.environ["PIPELINE_NAME"],
+                    },
+                ],
+                "Value": value,
+                "Unit": "Percent" if name == "ErrorRate" else "Milliseconds",
+            }
+            for name, value in statistics.items()
+        ],
+    )
+
+    exceeded = False
+    for name, variable in THRESHOLD_VARIABLES.items():
+        threshold = os.environ.get(variable)
+        if threshold and statistics[name] > float(threshold):
+            print(f"{name} exceeded the threshold: {threshold}")
+            exceeded = True
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
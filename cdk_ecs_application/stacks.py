@@ -1,8 +1,11 @@
+import os
+
 from aws_cdk import (
     Duration,
     SecretValue,
     Stack,
     aws_backup as backup,
+    aws_cloudwatch as cw,
     aws_codebuild as codebuild,
     aws_codecommit as codecommit,
     aws_codepipeline as codepipeline,
@@ -10,6 +13,9 @@ from aws_cdk import (
     aws_ec2 as ec2,
     aws_ecr as ecr,
     aws_ecs as ecs,
+    aws_iam as iam,
+    aws_rds as rds,
+    aws_s3_assets as s3_assets,
     aws_secretsmanager as secretsmanager,
     aws_sns as sns,
 )
@@ -17,11 +23,25 @@ from constructs import Construct
 
 from .constructs import (
     AuroraDatabase,
+    AuroraGlobalSecondary,
     AuroraServerless,
     EcsBatchTask,
     EcsWebService,
+    TaskStartupMetrics,
+)
+from .structs import (
+    AuroraConfig,
+    BackupPlanConfig,
+    EcsClusterConfig,
+    LoadTestConfig,
+    MaintenanceConfig,
+    RdsClusterConfig,
+    SecondaryRegionConfig,
+    VpcConfig,
 )
-from .structs import EcsClusterConfig, RdsClusterConfig
+
+SOCI_VERSION = "0.4.0"
+LOAD_TEST_METRIC_NAMESPACE = "EcsApplication/LoadTest"
 
 
 class RepositoryStack(Stack):
@@ -83,7 +103,10 @@ class PipelineStack(Stack):
         code_repository: codecommit.Repository,
         branch_name: str,
         image_repository: ecr.Repository,
-        service: ecs.FargateService | None,
+        services: dict[str, ecs.FargateService],
+        soci_index: bool = False,
+        load_test_config: LoadTestConfig | None = None,
+        load_test_host: str | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -139,7 +162,13 @@ class PipelineStack(Stack):
             ],
         )
 
-        if service:
+        if soci_index:
+            self._add_soci_index_stage(
+                build_artifact=build_artifact,
+                image_repository=image_repository,
+            )
+
+        if services:
             self.pipeline.add_stage(
                 stage_name="Deploy",
                 actions=[
@@ -147,21 +176,288 @@ class PipelineStack(Stack):
                         service=service,
                         deployment_timeout=Duration.minutes(5),
                         input=build_artifact,
-                        action_name="Deploy",
-                    ),
+                        action_name=f"Deploy-{service_name}",
+                    )
+                    for service_name, service in services.items()
                 ],
             )
 
+        if services and load_test_config and load_test_host:
+            self._add_load_test_stage(
+                build_artifact=build_artifact,
+                load_test_config=load_test_config,
+                target_url=load_test_config.target_url(load_test_host),
+            )
+
+    def _add_soci_index_stage(
+        self,
+        build_artifact: codepipeline.Artifact,
+        image_repository: ecr.Repository,
+    ) -> None:
+        soci_project = codebuild.PipelineProject(
+            self,
+            "SociIndexProject",
+            environment=codebuild.BuildEnvironment(
+                build_image=codebuild.LinuxBuildImage.STANDARD_6_0,
+                privileged=True,
+            ),
+            environment_variables={
+                "SOCI_VERSION": codebuild.BuildEnvironmentVariable(
+                    value=SOCI_VERSION,
+                ),
+            },
+            build_spec=codebuild.BuildSpec.from_object(
+                {
+                    "version": "0.2",
+                    "phases": {
+                        "install": {
+                            "commands": [
+                                "curl -sSL -o /tmp/soci.tar.gz https://github.com/awslabs/soci-snapshotter/releases/download/v${SOCI_VERSION}/soci-snapshotter-${SOCI_VERSION}-linux-amd64.tar.gz",  # noqa
+                                "tar -xzf /tmp/soci.tar.gz -C /usr/local/bin soci",  # noqa
+                                "nohup containerd > /tmp/containerd.log 2>&1 &",  # noqa
+                                "sleep 5",
+                            ],
+                        },
+                        "pre_build": {
+                            "commands": [
+                                "IMAGE_URI=$(jq -r '.[0].imageUri' imagedefinitions.json)",  # noqa
+                                "ECR_PASSWORD=$(aws ecr get-login-password)",
+                            ],
+                        },
+                        "build": {
+                            "commands": [
+                                'ctr image pull --user "AWS:${ECR_PASSWORD}" "${IMAGE_URI}"',  # noqa
+                                'soci create "${IMAGE_URI}"',
+                                'soci push --user "AWS:${ECR_PASSWORD}" "${IMAGE_URI}"',  # noqa
+                            ],
+                        },
+                    },
+                }
+            ),
+        )
+        image_repository.grant_pull_push(soci_project)
+        self.pipeline.add_stage(
+            stage_name="SociIndex",
+            actions=[
+                cpactions.CodeBuildAction(
+                    input=build_artifact,
+                    project=soci_project,
+                    action_name="SociIndex",
+                ),
+            ],
+        )
+
+    def _add_load_test_stage(
+        self,
+        build_artifact: codepipeline.Artifact,
+        load_test_config: LoadTestConfig,
+        target_url: str,
+    ) -> None:
+        script_asset = s3_assets.Asset(
+            self,
+            "LoadTestScript",
+            path=os.path.join(
+                os.path.dirname(__file__),
+                "scripts",
+                "load_test",
+            ),
+        )
+        thresholds = {
+            "MAX_P50_MS": load_test_config.max_p50_ms,
+            "MAX_P95_MS": load_test_config.max_p95_ms,
+            "MAX_P99_MS": load_test_config.max_p99_ms,
+            "MAX_ERROR_RATE_PERCENT": load_test_config.max_error_rate_percent,
+        }
+        load_test_project = codebuild.PipelineProject(
+            self,
+            "LoadTestProject",
+            environment=codebuild.BuildEnvironment(
+                build_image=codebuild.LinuxBuildImage.STANDARD_6_0,
+            ),
+            environment_variables={
+                "SCRIPT_URL": codebuild.BuildEnvironmentVariable(
+                    value=script_asset.s3_object_url,
+                ),
+                "TARGET_URL": codebuild.BuildEnvironmentVariable(
+                    value=target_url,
+                ),
+                "DURATION_SECONDS": codebuild.BuildEnvironmentVariable(
+                    value=str(int(load_test_config.duration.to_seconds())),
+                ),
+                "CONCURRENCY": codebuild.BuildEnvironmentVariable(
+                    value=str(load_test_config.concurrency),
+                ),
+                "METRIC_NAMESPACE": codebuild.BuildEnvironmentVariable(
+                    value=LOAD_TEST_METRIC_NAMESPACE,
+                ),
+                "PIPELINE_NAME": codebuild.BuildEnvironmentVariable(
+                    value=self.pipeline.pipeline_name,
+                ),
+                **{
+                    name: codebuild.BuildEnvironmentVariable(value=str(value))
+                    for name, value in thresholds.items()
+                    if value is not None
+                },
+            },
+            build_spec=codebuild.BuildSpec.from_object(
+                {
+                    "version": "0.2",
+                    "phases": {
+                        "install": {
+                            "commands": [
+                                "pip3 install --quiet boto3",
+                                'aws s3 cp "${SCRIPT_URL}" /tmp/load_test.zip',
+                                "unzip -o /tmp/load_test.zip -d /tmp/load_test",  # noqa
+                            ],
+                        },
+                        "build": {
+                            "commands": [
+                                "python3 /tmp/load_test/load_test.py",
+                            ],
+                        },
+                    },
+                }
+            ),
+            timeout=load_test_config.duration.plus(Duration.minutes(10)),
+        )
+        script_asset.grant_read(load_test_project)
+        load_test_project.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["cloudwatch:PutMetricData"],
+                resources=["*"],
+                conditions={
+                    "StringEquals": {
+                        "cloudwatch:namespace": LOAD_TEST_METRIC_NAMESPACE,
+                    },
+                },
+            )
+        )
+        self.pipeline.add_stage(
+            stage_name="LoadTest",
+            actions=[
+                cpactions.CodeBuildAction(
+                    input=build_artifact,
+                    project=load_test_project,
+                    action_name="LoadTest",
+                ),
+            ],
+        )
+
+
+class BaseAppStack(Stack):
+    def _add_vpc(self, vpc_config: VpcConfig) -> None:
+        subnet_configuration = [
+            ec2.SubnetConfiguration(
+                name="Public",
+                subnet_type=ec2.SubnetType.PUBLIC,
+                cidr_mask=vpc_config.cidr_mask,
+            ),
+            ec2.SubnetConfiguration(
+                name="Private",
+                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
+                cidr_mask=vpc_config.cidr_mask,
+            ),
+        ]
+        if vpc_config.isolated_database_subnet:
+            subnet_configuration.append(
+                ec2.SubnetConfiguration(
+                    name="Database",
+                    subnet_type=ec2.SubnetType.PRIVATE_ISOLATED,
+                    cidr_mask=vpc_config.cidr_mask,
+                )
+            )
+        self.vpc = ec2.Vpc(
+            self,
+            "Vpc",
+            ip_addresses=(
+                vpc_config.cidr and ec2.IpAddresses.cidr(vpc_config.cidr)
+            ),
+            subnet_configuration=subnet_configuration,
+            max_azs=vpc_config.max_azs,
+            nat_gateways=vpc_config.nat_gateways,
+        )
+        self.database_subnets = (
+            ec2.SubnetSelection(subnet_group_name="Database")
+            if vpc_config.isolated_database_subnet
+            else None
+        )
+
+    def _add_ecs_cluster(self, ecs_cluster_config: EcsClusterConfig) -> None:
+        self.ecs_cluster = ecs.Cluster(
+            self,
+            "EcsCluster",
+            vpc=self.vpc,
+            container_insights=True,
+            enable_fargate_capacity_providers=True,
+        )
+
+        if ecs_cluster_config.use_service_connect:
+            self.ecs_cluster.add_default_cloud_map_namespace(
+                name=ecs_cluster_config.namespace,
+                use_for_service_connect=True,
+            )
+
+        self.task_startup_metrics = TaskStartupMetrics(
+            self,
+            "TaskStartupMetrics",
+            cluster=self.ecs_cluster,
+        )
 
-class AppStack(Stack):
+    def _add_web_services(
+        self,
+        ecs_cluster_config: EcsClusterConfig,
+        db_secret: secretsmanager.Secret,
+        db_host: str | None = None,
+    ) -> None:
+        self.web_service = EcsWebService(
+            self,
+            "WebService",
+            cluster=self.ecs_cluster,
+            web_config=ecs_cluster_config.default_web_config,
+            db_secret=db_secret,
+            db_host=db_host,
+        )
+        self.web_services = {
+            ecs_cluster_config.default_web_config.service_name: self.web_service,  # noqa
+            **{
+                web_config.service_name: EcsWebService(
+                    self,
+                    f"WebService-{web_config.service_name}",
+                    cluster=self.ecs_cluster,
+                    web_config=web_config,
+                    db_secret=db_secret,
+                    db_host=db_host,
+                    listener=self.web_service.listener,
+                )
+                for web_config in ecs_cluster_config.routed_web_configs
+            },
+        }
+
+        service_connect_widgets = [
+            web_service.service_connect_widgets()
+            for web_service in self.web_services.values()
+            if web_service.service_connect_config
+        ]
+        if service_connect_widgets:
+            self.service_connect_dashboard = cw.Dashboard(
+                self,
+                "ServiceConnectDashboard",
+                widgets=service_connect_widgets,
+            )
+
+
+class AppStack(BaseAppStack):
     def __init__(
         self,
         scope: Construct,
         construct_id: str,
+        vpc_config: VpcConfig,
         rds_cluster_config: RdsClusterConfig,
         ecs_cluster_config: EcsClusterConfig,
+        maintenance_config: MaintenanceConfig,
         backup_target_tag: dict[str, str] | None = None,
         enable_alarm: bool = False,
+        global_cluster_identifier: str | None = None,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -175,27 +471,15 @@ class AppStack(Stack):
             else None
         )
 
-        self.vpc = ec2.Vpc(
-            self,
-            "Vpc",
-            subnet_configuration=[
-                ec2.SubnetConfiguration(
-                    name="Public",
-                    subnet_type=ec2.SubnetType.PUBLIC,
-                ),
-                ec2.SubnetConfiguration(
-                    name="Private",
-                    subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
-                ),
-            ],
-            max_azs=2,
-        )
+        self._add_vpc(vpc_config)
 
         self.database = (
             AuroraServerless(
                 self,
                 "Aurora",
                 vpc=self.vpc,
+                vpc_subnets=self.database_subnets,
+                maintenance_config=maintenance_config,
                 aurora_config=rds_cluster_config.aurora_config,
                 serverless_config=rds_cluster_config.serverless_config,
                 alarm_destination_topic=self.alarm_destination_topic,
@@ -205,25 +489,27 @@ class AppStack(Stack):
                 self,
                 "Aurora",
                 vpc=self.vpc,
+                vpc_subnets=self.database_subnets,
+                maintenance_config=maintenance_config,
                 aurora_config=rds_cluster_config.aurora_config,
                 database_config=rds_cluster_config.database_config,
                 alarm_destination_topic=self.alarm_destination_topic,
             )
         )
 
-        self.ecs_cluster = ecs.Cluster(
-            self,
-            "EcsCluster",
-            vpc=self.vpc,
-            container_insights=True,
-            enable_fargate_capacity_providers=True,
-        )
+        if global_cluster_identifier:
+            self.global_cluster = rds.CfnGlobalCluster(
+                self,
+                "GlobalCluster",
+                global_cluster_identifier=global_cluster_identifier,
+                source_db_cluster_identifier=(
+                    self.database.cluster.cluster_identifier
+                ),
+            )
 
-        self.web_service = EcsWebService(
-            self,
-            "WebService",
-            cluster=self.ecs_cluster,
-            web_config=ecs_cluster_config.web_config,
+        self._add_ecs_cluster(ecs_cluster_config)
+        self._add_web_services(
+            ecs_cluster_config,
             db_secret=self.database.cluster.secret,
         )
         self.batch_tasks = {
@@ -234,17 +520,45 @@ class AppStack(Stack):
                 task_config=batch_config.task_config,
                 schedule=batch_config.schedule,
                 db_secret=self.database.cluster.secret,
+                db_resume_function=(
+                    self.database.resume_function
+                    if batch_config.warm_database
+                    else None
+                ),
             )
             for batch_config in ecs_cluster_config.batch_configs
         }
 
         if backup_target_tag:
-            self._add_backup(target_tag=backup_target_tag)
+            self._add_backup(
+                target_tag=backup_target_tag,
+                backup_plan_config=maintenance_config.backup_plan_config,
+            )
 
-    def _add_backup(self, target_tag: dict[str, str]) -> None:
-        self.backup_plan = backup.BackupPlan.daily35_day_retention(
-            self,
-            "BackupPlan",
+    def _add_backup(
+        self,
+        target_tag: dict[str, str],
+        backup_plan_config: BackupPlanConfig | None = None,
+    ) -> None:
+        self.backup_plan = (
+            backup.BackupPlan(
+                self,
+                "BackupPlan",
+                backup_plan_rules=[
+                    backup.BackupPlanRule(
+                        rule_name="Scheduled",
+                        schedule_expression=backup_plan_config.schedule,
+                        start_window=backup_plan_config.start_window,
+                        completion_window=backup_plan_config.completion_window,
+                        delete_after=backup_plan_config.delete_after,
+                    ),
+                ],
+            )
+            if backup_plan_config
+            else backup.BackupPlan.daily35_day_retention(
+                self,
+                "BackupPlan",
+            )
         )
         self.backup_plan.add_selection(
             "Selection",
@@ -253,3 +567,36 @@ class AppStack(Stack):
                 for key, value in target_tag.items()
             ],
         )
+
+
+class SecondaryAppStack(BaseAppStack):
+    def __init__(
+        self,
+        scope: Construct,
+        construct_id: str,
+        secondary_region_config: SecondaryRegionConfig,
+        aurora_config: AuroraConfig,
+        global_cluster_identifier: str,
+        db_secret: secretsmanager.Secret,
+        **kwargs,
+    ) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        self._add_vpc(secondary_region_config.vpc_config)
+
+        self.database = AuroraGlobalSecondary(
+            self,
+            "Aurora",
+            vpc=self.vpc,
+            vpc_subnets=self.database_subnets,
+            aurora_config=aurora_config,
+            database_config=secondary_region_config.database_config,
+            global_cluster_identifier=global_cluster_identifier,
+        )
+
+        self._add_ecs_cluster(secondary_region_config.ecs_cluster_config)
+        self._add_web_services(
+            secondary_region_config.ecs_cluster_config,
+            db_secret=db_secret,
+            db_host=self.database.reader_endpoint,
+        )
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any
 
 from aws_cdk import (
@@ -6,11 +6,373 @@ from aws_cdk import (
     aws_applicationautoscaling as appscaling,
     aws_ec2 as ec2,
     aws_ecr as ecr,
+    aws_ecs as ecs,
     aws_elasticloadbalancingv2 as elbv2,
+    aws_events as events,
     aws_rds as rds,
     aws_secretsmanager as secretsmanager,
 )
 
+from .classes import StorageType
+from .presets import AURORA_PARAMETER_PRESETS, FARGATE_TASK_SIZES
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+WEEK_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+IO_OPTIMIZED_MIN_VERSION = (3, 3, 1)
+EMF_SERVICE_TYPE = "AWS::ECS::Container"
+PARALLEL_QUERY_MIN_VERSIONS = {
+    2: (2, 9, 0),
+    3: (3, 1, 0),
+}
+
+
+def _version_tuple(version: str) -> tuple[int, ...]:
+    return tuple(int(number) for number in version.split("."))
+
+
+def _aurora_version(version: str) -> tuple[int, ...]:
+    # old-form versions such as `5.7.12` are not Aurora versions
+    aurora_version = _version_tuple(version)
+    if aurora_version[0] not in (2, 3):
+        raise ValueError(
+            f"engine version {version} must be an Aurora MySQL version such as `3.04.0`"  # noqa
+        )
+    return aurora_version
+
+
+def _minute_of_day(time: str) -> int:
+    hour, minute = time.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+def _daily_window(window: str) -> list[tuple[int, int]]:
+    start, end = (_minute_of_day(time) for time in window.split("-"))
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return [
+        (day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end)
+        for day in range(7)
+    ]
+
+
+def _weekly_window(window: str) -> list[tuple[int, int]]:
+    start, end = (
+        WEEK_DAYS.index(time[:3].lower()) * MINUTES_PER_DAY
+        + _minute_of_day(time[4:])
+        for time in window.split("-")
+    )
+    if end <= start:
+        end += MINUTES_PER_WEEK
+    return [(start, end)]
+
+
+def _windows_overlap(
+    windows: list[tuple[int, int]],
+    other_windows: list[tuple[int, int]],
+) -> bool:
+    return any(
+        start < other_end + shift and other_start + shift < end
+        for start, end in windows
+        for other_start, other_end in other_windows
+        for shift in (-MINUTES_PER_WEEK, 0, MINUTES_PER_WEEK)
+    )
+
+
+def _aurora_mysql_engine_version(
+    version: str,
+) -> rds.AuroraMysqlEngineVersion:
+    version_number = version.replace(".", "_")
+    if hasattr(rds.AuroraMysqlEngineVersion, f"VER_{version_number}"):
+        return getattr(rds.AuroraMysqlEngineVersion, f"VER_{version_number}")
+
+    # versions released after the pinned aws-cdk-lib
+    mysql_version = {2: "5.7", 3: "8.0"}[_aurora_version(version)[0]]
+    return rds.AuroraMysqlEngineVersion.of(
+        f"{mysql_version}.mysql_aurora.{version}",
+        mysql_version,
+    )
+
+
+def _check_storage_type(storage_type: StorageType, version: str) -> None:
+    if (
+        storage_type == StorageType.IO_OPTIMIZED
+        and _aurora_version(version) < IO_OPTIMIZED_MIN_VERSION
+    ):
+        raise ValueError(
+            f"I/O-Optimized storage is not supported by engine version {version}"  # noqa
+        )
+
+
+@dataclass
+class VpcConfig:
+    max_azs: int = 2
+    nat_gateways: int | None = None
+    cidr: str | None = None
+    cidr_mask: int | None = None
+    isolated_database_subnet: bool = False
+
+    def __post_init__(self) -> None:
+        if self.nat_gateways is not None and not (
+            1 <= self.nat_gateways <= self.max_azs
+        ):
+            raise ValueError("`nat_gateways` must be between 1 and `max_azs`")
+
+    @classmethod
+    def from_object(cls, config: dict[str, Any]):
+        vpc_config = config.get("vpc", {})
+
+        return cls(
+            max_azs=vpc_config.get("maxAzs", 2),
+            nat_gateways=vpc_config.get("natGateways"),
+            cidr=vpc_config.get("cidr"),
+            cidr_mask=vpc_config.get("cidrMask"),
+            isolated_database_subnet=vpc_config.get(
+                "isolatedDatabaseSubnet", False
+            ),
+        )
+
+
+@dataclass
+class LoadTestConfig:
+    path: str = "/"
+    base_url: str | None = None
+    duration: Duration = Duration.minutes(1)
+    concurrency: int = 10
+    max_p50_ms: float | None = None
+    max_p95_ms: float | None = None
+    max_p99_ms: float | None = None
+    max_error_rate_percent: float | None = None
+
+    def __post_init__(self) -> None:
+        if not self.path.startswith("/"):
+            raise ValueError("`path` must start with `/`")
+        if self.concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1")
+        if self.base_url and not self.base_url.startswith(
+            ("http://", "https://")
+        ):
+            raise ValueError(
+                "`base_url` must start with `http://` or `https://`"
+            )
+
+    def target_url(self, load_balancer_dns_name: str) -> str:
+        base_url = self.base_url or f"http://{load_balancer_dns_name}"
+        return base_url.rstrip("/") + self.path
+
+    @classmethod
+    def from_object(cls, config: dict[str, Any]):
+        load_test_config = config["loadTest"]
+        thresholds = load_test_config.get("thresholds", {})
+
+        # the certificate does not match the DNS name of the load balancer,
+        # an https service is reached through its own domain only
+        web_configs = config["stageConfig"]["development"]["ecs"]["web"]
+        if isinstance(web_configs, dict):
+            web_configs = [web_configs]
+        default_web_config = next(
+            web_config
+            for web_config in web_configs
+            if "routing" not in web_config
+        )
+        if "https" in default_web_config and "url" not in load_test_config:
+            raise ValueError(
+                "`loadTest.url` must be specified when the development web service uses https"  # noqa
+            )
+
+        return cls(
+            path=load_test_config.get("path", "/"),
+            base_url=load_test_config.get("url"),
+            duration=Duration.seconds(
+                load_test_config.get("durationSeconds", 60)
+            ),
+            concurrency=load_test_config.get("concurrency", 10),
+            max_p50_ms=thresholds.get("p50Ms"),
+            max_p95_ms=thresholds.get("p95Ms"),
+            max_p99_ms=thresholds.get("p99Ms"),
+            max_error_rate_percent=thresholds.get("errorRatePercent"),
+        )
+
+
+def _health_check_from_object(config: dict[str, Any]) -> ecs.HealthCheck:
+    return ecs.HealthCheck(
+        command=config["command"],
+        interval=(
+            Duration.seconds(config["intervalSeconds"])
+            if "intervalSeconds" in config
+            else None
+        ),
+        timeout=(
+            Duration.seconds(config["timeoutSeconds"])
+            if "timeoutSeconds" in config
+            else None
+        ),
+        retries=config.get("retries"),
+        start_period=(
+            Duration.seconds(config["startPeriodSeconds"])
+            if "startPeriodSeconds" in config
+            else None
+        ),
+    )
+
+
+@dataclass
+class SidecarConfig:
+    container_name: str
+    image: ecs.ContainerImage
+    cpu: int | None = None
+    memory: int | None = None
+    container_port: int | None = None
+    ingress: bool = False
+    essential: bool = True
+    command: list[str] | None = None
+    environment: dict[str, str] | None = None
+    health_check: ecs.HealthCheck | None = None
+    depends_on: dict[str, ecs.ContainerDependencyCondition] = field(
+        default_factory=dict
+    )
+
+    def __post_init__(self) -> None:
+        if self.ingress and self.container_port is None:
+            raise ValueError(
+                "`container_port` must be specified for the ingress sidecar"
+            )
+
+    @classmethod
+    def from_object(
+        cls,
+        config: dict[str, Any],
+        repository: ecr.Repository,
+    ):
+        return cls(
+            container_name=config["containerName"],
+            image=(
+                ecs.ContainerImage.from_registry(config["image"])
+                if "image" in config
+                else ecs.ContainerImage.from_ecr_repository(
+                    repository=repository,
+                    tag=config["tag"],
+                )
+            ),
+            cpu=config.get("cpu"),
+            memory=config.get("memory"),
+            container_port=config.get("containerPort"),
+            ingress=config.get("ingress", False),
+            essential=config.get("essential", True),
+            command=config.get("command"),
+            environment=config.get("environment"),
+            health_check=(
+                _health_check_from_object(config["healthCheck"])
+                if "healthCheck" in config
+                else None
+            ),
+            depends_on={
+                dependency["containerName"]: getattr(
+                    ecs.ContainerDependencyCondition,
+                    dependency["condition"],
+                )
+                for dependency in config.get("dependsOn", [])
+            },
+        )
+
+
+@dataclass
+class BackupPlanConfig:
+    cron: dict[str, str]
+    start_window: Duration = Duration.hours(1)
+    completion_window: Duration = Duration.hours(2)
+    delete_after: Duration = Duration.days(35)
+
+    @property
+    def schedule(self) -> events.Schedule:
+        return events.Schedule.cron(**self.cron)
+
+    @property
+    def start_windows(self) -> list[tuple[int, int]]:
+        # only a fixed daily start time can be checked against other windows
+        hour = str(self.cron.get("hour", ""))
+        minute = str(self.cron.get("minute", ""))
+        if not (hour.isdigit() and minute.isdigit()):
+            return []
+        start = int(hour) * 60 + int(minute)
+        end = start + int(self.start_window.to_minutes())
+        return [
+            (day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end)
+            for day in range(7)
+        ]
+
+
+@dataclass
+class MaintenanceConfig:
+    preferred_backup_window: str | None = None
+    preferred_maintenance_window: str | None = None
+    backup_retention: Duration = Duration.days(1)
+    backup_plan_config: BackupPlanConfig | None = None
+
+    def __post_init__(self) -> None:
+        backup_windows = (
+            _daily_window(self.preferred_backup_window)
+            if self.preferred_backup_window
+            else []
+        )
+        maintenance_windows = (
+            _weekly_window(self.preferred_maintenance_window)
+            if self.preferred_maintenance_window
+            else []
+        )
+        backup_plan_windows = (
+            self.backup_plan_config.start_windows
+            if self.backup_plan_config
+            else []
+        )
+
+        if _windows_overlap(backup_windows, maintenance_windows):
+            raise ValueError(
+                "`preferred_backup_window` must not overlap `preferred_maintenance_window`"  # noqa
+            )
+        if _windows_overlap(backup_plan_windows, backup_windows):
+            raise ValueError(
+                "start window of backup plan must not overlap `preferred_backup_window`"  # noqa
+            )
+        if _windows_overlap(backup_plan_windows, maintenance_windows):
+            raise ValueError(
+                "start window of backup plan must not overlap `preferred_maintenance_window`"  # noqa
+            )
+
+    @classmethod
+    def from_object(cls, config: dict[str, Any]):
+        maintenance_config = config.get("maintenance", {})
+        backup_plan_config = maintenance_config.get("backupPlan")
+
+        return cls(
+            preferred_backup_window=maintenance_config.get(
+                "preferredBackupWindow"
+            ),
+            preferred_maintenance_window=maintenance_config.get(
+                "preferredMaintenanceWindow"
+            ),
+            backup_retention=Duration.days(
+                maintenance_config.get("backupRetentionDays", 1)
+            ),
+            backup_plan_config=(
+                BackupPlanConfig(
+                    cron=backup_plan_config["cron"],
+                    start_window=Duration.minutes(
+                        backup_plan_config.get("startWindowMinutes", 60)
+                    ),
+                    completion_window=Duration.minutes(
+                        backup_plan_config.get("completionWindowMinutes", 120)
+                    ),
+                    delete_after=Duration.days(
+                        backup_plan_config.get("retentionDays", 35)
+                    ),
+                )
+                if backup_plan_config
+                else None
+            ),
+        )
+
 
 @dataclass
 class TaskConfig:
@@ -23,6 +385,45 @@ class TaskConfig:
     cpu: int = 256
     memory: int = 512
     command: list[str] | None = None
+    health_check: ecs.HealthCheck | None = None
+    sidecar_configs: list[SidecarConfig] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.memory not in FARGATE_TASK_SIZES.get(self.cpu, []):
+            raise ValueError(
+                f"cpu {self.cpu} and memory {self.memory} is not a valid Fargate task size"  # noqa
+            )
+        container_names = [self.container_name] + [
+            sidecar_config.container_name
+            for sidecar_config in self.sidecar_configs
+        ]
+        if len(container_names) != len(set(container_names)):
+            raise ValueError("container names in a task must be unique")
+        if len(self.ingress_sidecar_configs) > 1:
+            raise ValueError("only one sidecar can be used as ingress")
+        for sidecar_config in self.sidecar_configs:
+            if set(sidecar_config.depends_on) - set(container_names):
+                raise ValueError(
+                    f"`depends_on` of {sidecar_config.container_name} refers to an unknown container"  # noqa
+                )
+        if (
+            sum(
+                sidecar_config.memory or 0
+                for sidecar_config in self.sidecar_configs
+            )
+            >= self.memory
+        ):
+            raise ValueError(
+                "memory of sidecars must be less than the task memory"
+            )
+
+    @property
+    def ingress_sidecar_configs(self) -> list[SidecarConfig]:
+        return [
+            sidecar_config
+            for sidecar_config in self.sidecar_configs
+            if sidecar_config.ingress
+        ]
 
 
 @dataclass
@@ -32,33 +433,123 @@ class HttpsConfig:
     redirect_http: bool = True
 
 
+@dataclass
+class CustomMetricScalingConfig:
+    metric_name: str
+    # None means the default dimensions of the embedded metrics libraries
+    dimensions: dict[str, str] | None = None
+    statistic: str = "Average"
+    period: Duration = Duration.minutes(1)
+    target_value: float | None = None
+    scaling_steps: list[appscaling.ScalingInterval] = field(
+        default_factory=list
+    )
+
+    def __post_init__(self) -> None:
+        if (self.target_value is None) == (not self.scaling_steps):
+            raise ValueError(
+                "exactly one of `target_value` or `scaling_steps` must be specified"  # noqa
+            )
+        if self.scaling_steps and len(self.scaling_steps) < 2:
+            raise ValueError("`scaling_steps` must have at least 2 intervals")
+
+    @classmethod
+    def from_object(cls, config: dict[str, Any]):
+        return cls(
+            metric_name=config["metricName"],
+            dimensions=config.get("dimensions"),
+            statistic=config.get("statistic", "Average"),
+            period=Duration.seconds(config.get("periodSeconds", 60)),
+            target_value=config.get("targetValue"),
+            scaling_steps=[
+                appscaling.ScalingInterval(
+                    lower=_step.get("lower"),
+                    upper=_step.get("upper"),
+                    change=_step["change"],
+                )
+                for _step in config.get("steps", [])
+            ],
+        )
+
+
 @dataclass
 class AutoScalingConfig:
     min_capacity: int = 1
     max_capacity: int = 2
     cpu_percent: int = 70
     memory_percent: int = 70
+    metric_namespace: str = "EcsApplication"
+    custom_metric_configs: list[CustomMetricScalingConfig] = field(
+        default_factory=list
+    )
 
 
 @dataclass
-class WebConfig:
-    task_config: TaskConfig
-    https_config: HttpsConfig | None = None
-    auto_scaling_config: AutoScalingConfig | None = None
-    use_spot: bool = False
+class RoutingConfig:
+    priority: int
+    path_patterns: list[str] | None = None
+    host_headers: list[str] | None = None
+
+    def __post_init__(self) -> None:
+        if not (self.path_patterns or self.host_headers):
+            raise ValueError(
+                "at least one of `path_patterns` or `host_headers` must be specified"  # noqa
+            )
 
 
 @dataclass
-class BatchConfig:
-    batch_name: str
-    task_config: TaskConfig
-    schedule: appscaling.Schedule
+class ServiceConnectConfig:
+    discovery_name: str
+    dns_name: str | None = None
+    port: int | None = None
+    app_protocol: ecs.AppProtocol | None = None
+    idle_timeout: Duration | None = None
+    per_request_timeout: Duration | None = None
+
+    @classmethod
+    def from_object(cls, config: dict[str, Any], default_discovery_name: str):
+        return cls(
+            discovery_name=config.get("discoveryName", default_discovery_name),
+            dns_name=config.get("dnsName"),
+            port=config.get("port"),
+            app_protocol=(
+                getattr(ecs.AppProtocol, config["appProtocol"])
+                if "appProtocol" in config
+                else None
+            ),
+            idle_timeout=(
+                Duration.seconds(config["idleTimeoutSeconds"])
+                if "idleTimeoutSeconds" in config
+                else None
+            ),
+            per_request_timeout=(
+                Duration.seconds(config["perRequestTimeoutSeconds"])
+                if "perRequestTimeoutSeconds" in config
+                else None
+            ),
+        )
 
 
 @dataclass
-class EcsClusterConfig:
-    web_config: WebConfig
-    batch_configs: list[BatchConfig]
+class WebConfig:
+    task_config: TaskConfig
+    https_config: HttpsConfig | None = None
+    auto_scaling_config: AutoScalingConfig | None = None
+    use_spot: bool = False
+    service_name: str = "web"
+    routing_config: RoutingConfig | None = None
+    service_connect_config: ServiceConnectConfig | None = None
+
+    def emf_dimensions(self, stack_name: str) -> dict[str, str]:
+        # the default dimension set of the embedded metrics libraries, each
+        # value is pinned through AWS_EMF_* environment variables. the stack
+        # name keeps the metrics of the stages in one account apart
+        service_name = f"{stack_name}-{self.service_name}"
+        return {
+            "LogGroup": f"{service_name}-metrics",
+            "ServiceName": service_name,
+            "ServiceType": EMF_SERVICE_TYPE,
+        }
 
     @classmethod
     def from_object(
@@ -67,45 +558,175 @@ class EcsClusterConfig:
         repository: ecr.Repository,
         secret: secretsmanager.Secret,
     ):
-        ecs_config = config["ecs"]
-
-        _web_config = ecs_config["web"]
-        web_config = WebConfig(
+        return cls(
             task_config=TaskConfig(
                 repository=repository,
-                tag=_web_config["tag"],
-                container_name=_web_config["containerName"],
-                container_port=_web_config["containerPort"],
+                tag=config["tag"],
+                container_name=config["containerName"],
+                container_port=config["containerPort"],
                 secret=secret,
-                secret_keys=_web_config["secretKeys"],
-                cpu=_web_config["cpu"],
-                memory=_web_config["memory"],
-                command=_web_config.get("command"),
+                secret_keys=config["secretKeys"],
+                cpu=config["cpu"],
+                memory=config["memory"],
+                command=config.get("command"),
+                health_check=(
+                    _health_check_from_object(config["healthCheck"])
+                    if "healthCheck" in config
+                    else None
+                ),
+                sidecar_configs=[
+                    SidecarConfig.from_object(
+                        _sidecar_config,
+                        repository=repository,
+                    )
+                    for _sidecar_config in config.get("sidecars", [])
+                ],
             ),
             https_config=(
                 HttpsConfig(
-                    certificate_arn=_web_config["https"]["certificateArn"],
+                    certificate_arn=config["https"]["certificateArn"],
                     ssl_policy=getattr(
-                        elbv2.SslPolicy, _web_config["https"]["sslPolicy"]
+                        elbv2.SslPolicy, config["https"]["sslPolicy"]
                     ),
-                    redirect_http=_web_config["https"]["redirectHttp"],
+                    redirect_http=config["https"]["redirectHttp"],
                 )
-                if "https" in _web_config
+                if "https" in config
                 else None
             ),
             auto_scaling_config=(
                 AutoScalingConfig(
-                    min_capacity=_web_config["autoScaling"]["minCapacity"],
-                    max_capacity=_web_config["autoScaling"]["maxCapacity"],
-                    cpu_percent=_web_config["autoScaling"]["cpuPercent"],
-                    memory_percent=_web_config["autoScaling"]["memoryPercent"],
+                    min_capacity=config["autoScaling"]["minCapacity"],
+                    max_capacity=config["autoScaling"]["maxCapacity"],
+                    cpu_percent=config["autoScaling"]["cpuPercent"],
+                    memory_percent=config["autoScaling"]["memoryPercent"],
+                    metric_namespace=config["autoScaling"].get(
+                        "metricNamespace", "EcsApplication"
+                    ),
+                    custom_metric_configs=[
+                        CustomMetricScalingConfig.from_object(
+                            _custom_metric_config
+                        )
+                        for _custom_metric_config in config["autoScaling"].get(
+                            "customMetrics", []
+                        )
+                    ],
                 )
-                if "autoScaling" in _web_config
+                if "autoScaling" in config
                 else None
             ),
-            use_spot=_web_config["useSpot"],
+            use_spot=config["useSpot"],
+            service_name=config.get("serviceName", "web"),
+            routing_config=(
+                RoutingConfig(
+                    priority=config["routing"]["priority"],
+                    path_patterns=config["routing"].get("pathPatterns"),
+                    host_headers=config["routing"].get("hostHeaders"),
+                )
+                if "routing" in config
+                else None
+            ),
+            service_connect_config=(
+                ServiceConnectConfig.from_object(
+                    config["serviceConnect"],
+                    default_discovery_name=config.get("serviceName", "web"),
+                )
+                if "serviceConnect" in config
+                else None
+            ),
+        )
+
+
+@dataclass
+class BatchConfig:
+    batch_name: str
+    task_config: TaskConfig
+    schedule: appscaling.Schedule
+    warm_database: bool = False
+
+
+@dataclass
+class EcsClusterConfig:
+    web_configs: list[WebConfig]
+    batch_configs: list[BatchConfig]
+    namespace: str = "internal"
+
+    def __post_init__(self) -> None:
+        if len(self.web_configs) - len(self.routed_web_configs) != 1:
+            raise ValueError(
+                "exactly one web service must be specified without `routing_config`"  # noqa
+            )
+        service_names = [
+            web_config.service_name for web_config in self.web_configs
+        ]
+        if len(service_names) != len(set(service_names)):
+            raise ValueError("`service_name` of web services must be unique")
+        # the pipeline deploys every web service from the same
+        # imagedefinitions.json, which names a single container
+        container_names = {
+            web_config.task_config.container_name
+            for web_config in self.web_configs
+        }
+        if len(container_names) != 1:
+            raise ValueError(
+                "`container_name` of web services must be the same"
+            )
+        priorities = [
+            web_config.routing_config.priority
+            for web_config in self.routed_web_configs
+        ]
+        if len(priorities) != len(set(priorities)):
+            raise ValueError("`priority` of web services must be unique")
+        if any(
+            web_config.https_config for web_config in self.routed_web_configs
+        ):
+            raise ValueError(
+                "`https_config` can only be specified for the default web service"  # noqa
+            )
+
+    @property
+    def default_web_config(self) -> WebConfig:
+        return next(
+            web_config
+            for web_config in self.web_configs
+            if not web_config.routing_config
         )
 
+    @property
+    def use_service_connect(self) -> bool:
+        return any(
+            web_config.service_connect_config is not None
+            for web_config in self.web_configs
+        )
+
+    @property
+    def routed_web_configs(self) -> list[WebConfig]:
+        return [
+            web_config
+            for web_config in self.web_configs
+            if web_config.routing_config
+        ]
+
+    @classmethod
+    def from_object(
+        cls,
+        config: dict[str, Any],
+        repository: ecr.Repository,
+        secret: secretsmanager.Secret,
+    ):
+        ecs_config = config["ecs"]
+
+        _web_configs = ecs_config["web"]
+        if isinstance(_web_configs, dict):
+            _web_configs = [_web_configs]
+        web_configs = [
+            WebConfig.from_object(
+                _web_config,
+                repository=repository,
+                secret=secret,
+            )
+            for _web_config in _web_configs
+        ]
+
         batch_configs = [
             BatchConfig(
                 batch_name=_batch_config["batchName"],
@@ -113,7 +734,7 @@ class EcsClusterConfig:
                     repository=repository,
                     tag=_batch_config["tag"],
                     container_name=_batch_config["containerName"],
-                    container_port=_web_config["containerPort"],
+                    container_port=web_configs[0].task_config.container_port,
                     secret=secret,
                     secret_keys=_batch_config["secretKeys"],
                     cpu=_batch_config["cpu"],
@@ -121,13 +742,15 @@ class EcsClusterConfig:
                     command=_batch_config.get("command"),
                 ),
                 schedule=appscaling.Schedule.cron(**_batch_config["cron"]),
+                warm_database=_batch_config.get("warmDatabase", False),
             )
-            for _batch_config in ecs_config["batches"]
+            for _batch_config in ecs_config.get("batches", [])
         ]
 
         return cls(
-            web_config=web_config,
+            web_configs=web_configs,
             batch_configs=batch_configs,
+            namespace=ecs_config.get("namespace", "internal"),
         )
 
 
@@ -136,6 +759,21 @@ class AuroraConfig:
     engine_version: rds.AuroraMysqlEngineVersion
     parameters: dict[str, str]
     database_name: str
+    instance_parameters: dict[str, str] = field(default_factory=dict)
+    preset: str | None = None
+    parallel_query: bool = False
+
+    def __post_init__(self) -> None:
+        if self.preset and self.preset not in AURORA_PARAMETER_PRESETS:
+            raise ValueError(
+                f"`preset` must be one of {', '.join(AURORA_PARAMETER_PRESETS)}"  # noqa
+            )
+
+
+@dataclass
+class WarmWindowConfig:
+    start: events.Schedule
+    end: events.Schedule
 
 
 @dataclass
@@ -143,12 +781,20 @@ class ServerlessConfig:
     min_capacity: rds.AuroraCapacityUnit
     max_capacity: rds.AuroraCapacityUnit
     auto_pause: Duration | None = None
+    warm_window_configs: list[WarmWindowConfig] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        if self.warm_window_configs and not self.auto_pause:
+            raise ValueError(
+                "`warm_window_configs` can only be specified with `auto_pause`"
+            )
 
 
 @dataclass
 class DatabaseConfig:
     instance_type: ec2.InstanceType
     instances: int
+    storage_type: StorageType = StorageType.STANDARD
 
 
 @dataclass
@@ -164,19 +810,35 @@ class RdsClusterConfig:
             raise ValueError(
                 "only one of `serverless_config` or `database_config` must be specified"  # noqa
             )
+        if self.serverless_config and self.aurora_config.parallel_query:
+            raise ValueError(
+                "`parallel_query` cannot be enabled for serverless cluster"
+            )
+        if self.serverless_config and self.aurora_config.instance_parameters:
+            raise ValueError(
+                "`instance_parameters` cannot be specified for serverless cluster"  # noqa
+            )
 
     @classmethod
     def from_object(cls, config: dict[str, Any]):
         rds_config = config["rds"]
-        version_number = rds_config["engineVersion"].replace(".", "_")
 
         aurora_config = AuroraConfig(
-            engine_version=getattr(
-                rds.AuroraMysqlEngineVersion, f"VER_{version_number}"
+            engine_version=_aurora_mysql_engine_version(
+                rds_config["engineVersion"]
             ),
             parameters=rds_config["parameters"],
             database_name=rds_config["databaseName"],
+            instance_parameters=rds_config.get("instanceParameters", {}),
+            preset=rds_config.get("preset"),
+            parallel_query=rds_config.get("parallelQuery", False),
         )
+        if aurora_config.parallel_query:
+            version = _aurora_version(rds_config["engineVersion"])
+            if version < PARALLEL_QUERY_MIN_VERSIONS[version[0]]:
+                raise ValueError(
+                    f"parallel query is not supported by engine version {rds_config['engineVersion']}"  # noqa
+                )
 
         serverless_config = None
         database_config = None
@@ -194,11 +856,26 @@ class RdsClusterConfig:
                 max_capacity=getattr(
                     rds.AuroraCapacityUnit, f"ACU_{rds_config['maxCapacity']}"
                 ),
+                warm_window_configs=[
+                    WarmWindowConfig(
+                        start=events.Schedule.cron(**_window["startCron"]),
+                        end=events.Schedule.cron(**_window["endCron"]),
+                    )
+                    for _window in rds_config.get("warmWindows", [])
+                ],
             )
         else:
             database_config = DatabaseConfig(
-                instance_type=ec2.InstanceType(rds_config["instanceType"]),
+                instance_type=ec2.InstanceType(
+                    rds_config["instanceType"].removeprefix("db.")
+                ),
                 instances=rds_config["instances"],
+                storage_type=StorageType(
+                    rds_config.get("storageType", StorageType.STANDARD.value)
+                ),
+            )
+            _check_storage_type(
+                database_config.storage_type, rds_config["engineVersion"]
             )
 
         return cls(
@@ -206,3 +883,55 @@ class RdsClusterConfig:
             serverless_config=serverless_config,
             database_config=database_config,
         )
+
+
+@dataclass
+class SecondaryRegionConfig:
+    region: str
+    vpc_config: VpcConfig
+    database_config: DatabaseConfig
+    ecs_cluster_config: EcsClusterConfig
+
+    def __post_init__(self) -> None:
+        if self.ecs_cluster_config.batch_configs:
+            raise ValueError("batches cannot be used in secondary region")
+
+    @classmethod
+    def from_object(
+        cls,
+        config: dict[str, Any],
+        repository: ecr.Repository,
+        secret: secretsmanager.Secret,
+    ):
+        if config["rds"]["serverless"]:
+            raise ValueError(
+                "secondary region requires a provisioned primary cluster (`serverless = false`)"  # noqa
+            )
+
+        secondary_config = config["secondaryRegion"]
+        rds_config = secondary_config["rds"]
+
+        database_config = DatabaseConfig(
+            instance_type=ec2.InstanceType(
+                rds_config["instanceType"].removeprefix("db.")
+            ),
+            instances=rds_config["instances"],
+            storage_type=StorageType(
+                rds_config.get("storageType", StorageType.STANDARD.value)
+            ),
+        )
+        # the secondary cluster runs the engine version of the primary
+        _check_storage_type(
+            database_config.storage_type, config["rds"]["engineVersion"]
+        )
+
+        return cls(
+            region=secondary_config["region"],
+            vpc_config=VpcConfig.from_object(secondary_config),
+            database_config=database_config,
+            ecs_cluster_config=EcsClusterConfig.from_object(
+                secondary_config,
+                repository=repository,
+                secret=secret,
+            ),
+        )
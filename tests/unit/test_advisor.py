@@ -0,0 +1,299 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cdk_ecs_application.advisor import (
+    advise,
+    build_patch,
+    load_metric,
+    recommend_cpu_percent,
+    recommend_task_size,
+)
+from cdk_ecs_application.presets import FARGATE_TASK_SIZES
+
+START = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+
+def _timestamps(count: int) -> list[datetime]:
+    return [START + timedelta(minutes=5 * i) for i in range(count)]
+
+
+def _series(values: list[float]) -> dict[datetime, float]:
+    return dict(zip(_timestamps(len(values)), values))
+
+
+@pytest.fixture
+def web_config():
+    return {
+        "tag": "latest",
+        "containerName": "app",
+        "cpu": 256,
+        "memory": 512,
+        "autoScaling": {
+            "minCapacity": 1,
+            "maxCapacity": 1,
+            "cpuPercent": 70,
+            "memoryPercent": 70,
+        },
+    }
+
+
+def test_load_metric_from_metric_data(tmp_path):
+    path = tmp_path / "cpu.json"
+    path.write_text(
+        json.dumps(
+            {
+                "MetricDataResults": [
+                    {
+                        "Id": "cpu",
+                        "Timestamps": [
+                            "2026-10-01T00:05:00Z",
+                            "2026-10-01T00:00:00Z",
+                        ],
+                        "Values": [20.0, 10.0],
+                    }
+                ]
+            }
+        )
+    )
+
+    assert load_metric(str(path)) == {
+        START + timedelta(minutes=5): 20.0,
+        START: 10.0,
+    }
+
+
+def test_load_metric_from_statistics(tmp_path):
+    path = tmp_path / "memory.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Datapoints": [
+                    {
+                        "Timestamp": "2026-10-01T00:00:00+00:00",
+                        "Maximum": 40.0,
+                        "Unit": "Percent",
+                    }
+                ]
+            }
+        )
+    )
+
+    assert load_metric(str(path)) == {START: 40.0}
+
+
+def test_load_metric_from_extended_statistics(tmp_path):
+    path = tmp_path / "latency.json"
+    path.write_text(
+        json.dumps(
+            {
+                "Datapoints": [
+                    {
+                        "Timestamp": "2026-10-01T00:00:00Z",
+                        "ExtendedStatistics": {"p95": 0.3},
+                    }
+                ]
+            }
+        )
+    )
+
+    assert load_metric(str(path)) == {START: 0.3}
+
+
+def test_load_metric_without_datapoints(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text(json.dumps({"Datapoints": []}))
+
+    assert load_metric(str(path)) == {}
+
+
+def test_recommend_task_size_smallest():
+    assert recommend_task_size(100, 300, 70, 10) == (256, 512)
+
+
+def test_recommend_task_size_for_memory():
+    assert recommend_task_size(100, 3000, 70, 10) == (512, 3072)
+
+
+def test_recommend_task_size_for_max_tasks():
+    # 2000 units need 12 tasks of 256 units, 6 tasks of 512 units at 70 %
+    assert recommend_task_size(2000, 300, 70, 10) == (512, 1024)
+
+
+def test_recommend_task_size_beyond_max_tasks():
+    assert recommend_task_size(200000, 600, 70, 10) == (16384, 32768)
+
+
+def test_recommend_task_size_is_valid():
+    for peak_cpu_demand in [10, 1000, 10000]:
+        for required_memory in [100, 5000, 50000]:
+            cpu, memory = recommend_task_size(
+                peak_cpu_demand, required_memory, 70, 10
+            )
+            assert memory in FARGATE_TASK_SIZES[cpu]
+            assert memory >= required_memory
+
+
+def test_recommend_task_size_without_candidates():
+    with pytest.raises(ValueError):
+        recommend_task_size(100, 200000, 70, 10)
+
+
+def test_recommend_cpu_percent_within_slo():
+    cpu_utilization = _series([65, 70, 75])
+    latency = _series([0.1, 0.2, 0.3])
+
+    assert recommend_cpu_percent(cpu_utilization, latency, 70, 500) == 70
+
+
+def test_recommend_cpu_percent_breaks_slo():
+    # latency is high above 50 % cpu only
+    cpu_utilization = _series([30, 45, 55, 65, 75])
+    latency = _series([0.1, 0.1, 0.8, 0.9, 1.0])
+
+    assert recommend_cpu_percent(cpu_utilization, latency, 70, 500) == 50
+
+
+def test_recommend_cpu_percent_minimum():
+    cpu_utilization = _series([35, 45, 55, 65])
+    latency = _series([1.0, 1.0, 1.0, 1.0])
+
+    assert recommend_cpu_percent(cpu_utilization, latency, 70, 500) == 40
+
+
+def test_recommend_cpu_percent_without_observations():
+    # nothing is observed near the target
+    cpu_utilization = _series([10, 20, 30])
+    latency = _series([1.0, 1.0, 1.0])
+
+    assert recommend_cpu_percent(cpu_utilization, latency, 70, 500) == 70
+
+
+def test_advise(web_config):
+    recommended_web_config, notes = advise(
+        web_config,
+        cpu_utilization=_series([20, 50, 90]),
+        memory_utilization=_series([40, 50, 60]),
+        task_count=_series([1, 2, 4]),
+    )
+
+    # peak cpu demand is 90 % of 256 units on 4 tasks
+    assert recommended_web_config["cpu"] == 256
+    assert recommended_web_config["memory"] == 512
+    assert recommended_web_config["autoScaling"] == {
+        "minCapacity": 1,
+        "maxCapacity": 8,
+        "cpuPercent": 70,
+        "memoryPercent": 70,
+    }
+    assert recommended_web_config["containerName"] == "app"
+    assert web_config["autoScaling"]["maxCapacity"] == 1
+    assert "peak cpu demand: 922 units" in notes
+
+
+def test_advise_for_memory(web_config):
+    recommended_web_config, _ = advise(
+        web_config,
+        cpu_utilization=_series([10, 10]),
+        memory_utilization=_series([90, 95]),
+    )
+
+    # 95 % of 512 MiB under the 70 % memory target
+    assert recommended_web_config["memory"] == 1024
+
+
+def test_advise_without_task_count(web_config):
+    _, notes = advise(
+        web_config,
+        cpu_utilization=_series([50]),
+        memory_utilization=_series([50]),
+    )
+
+    assert "no task count metric, assumed 1 running tasks" in notes
+
+
+def test_advise_with_latency(web_config):
+    recommended_web_config, _ = advise(
+        web_config,
+        cpu_utilization=_series([45, 55, 65]),
+        memory_utilization=_series([50, 50, 50]),
+        latency=_series([0.1, 0.9, 1.0]),
+        latency_slo_ms=500,
+    )
+
+    assert recommended_web_config["autoScaling"]["cpuPercent"] == 50
+
+
+def test_advise_keeps_custom_metrics(web_config):
+    web_config["autoScaling"]["customMetrics"] = [
+        {"metricName": "WorkerPoolOccupancy", "targetValue": 60}
+    ]
+    recommended_web_config, _ = advise(
+        web_config,
+        cpu_utilization=_series([50]),
+        memory_utilization=_series([50]),
+    )
+
+    assert recommended_web_config["autoScaling"]["customMetrics"] == [
+        {"metricName": "WorkerPoolOccupancy", "targetValue": 60}
+    ]
+
+
+def test_advise_without_metrics(web_config):
+    with pytest.raises(ValueError):
+        advise(web_config, cpu_utilization={}, memory_utilization={})
+
+
+def test_build_patch_for_single_web_service(web_config):
+    config = {"stageConfig": {"production": {"ecs": {"web": web_config}}}}
+    recommended_web_config = {
+        **web_config,
+        "cpu": 512,
+        "memory": 1024,
+    }
+
+    assert build_patch(
+        config,
+        stage="production",
+        service_name="web",
+        recommended_web_config=recommended_web_config,
+    ) == {
+        "stageConfig": {
+            "production": {
+                "ecs": {
+                    "web": {
+                        "cpu": 512,
+                        "memory": 1024,
+                        "autoScaling": web_config["autoScaling"],
+                    }
+                }
+            }
+        }
+    }
+
+
+def test_build_patch_for_web_services(web_config):
+    api_web_config = {
+        **web_config,
+        "serviceName": "api",
+        "routing": {"priority": 10, "pathPatterns": ["/api/*"]},
+    }
+    config = {
+        "stageConfig": {
+            "production": {"ecs": {"web": [web_config, api_web_config]}}
+        }
+    }
+    recommended_web_config = {**api_web_config, "cpu": 512, "memory": 1024}
+
+    patch = build_patch(
+        config,
+        stage="production",
+        service_name="api",
+        recommended_web_config=recommended_web_config,
+    )
+
+    assert patch["stageConfig"]["production"]["ecs"]["web"] == [
+        web_config,
+        recommended_web_config,
+    ]
@@ -0,0 +1,203 @@
+import pytest
+from aws_cdk import Duration
+
+from cdk_ecs_application.structs import (
+    MINUTES_PER_DAY,
+    MINUTES_PER_WEEK,
+    BackupPlanConfig,
+    MaintenanceConfig,
+    SecondaryRegionConfig,
+    TaskConfig,
+    _aurora_version,
+    _daily_window,
+    _weekly_window,
+    _windows_overlap,
+)
+
+
+def test_daily_window():
+    windows = _daily_window("17:00-17:30")
+
+    assert len(windows) == 7
+    assert windows[0] == (17 * 60, 17 * 60 + 30)
+    assert windows[6] == (
+        6 * MINUTES_PER_DAY + 17 * 60,
+        6 * MINUTES_PER_DAY + 17 * 60 + 30,
+    )
+
+
+def test_daily_window_across_midnight():
+    assert _daily_window("23:30-00:30")[0] == (23 * 60 + 30, 24 * 60 + 30)
+
+
+def test_weekly_window():
+    assert _weekly_window("sat:18:00-sat:18:30") == [
+        (5 * MINUTES_PER_DAY + 18 * 60, 5 * MINUTES_PER_DAY + 18 * 60 + 30)
+    ]
+
+
+def test_weekly_window_across_week_end():
+    assert _weekly_window("Sun:23:30-Mon:00:30") == [
+        (6 * MINUTES_PER_DAY + 23 * 60 + 30, MINUTES_PER_WEEK + 30)
+    ]
+
+
+def test_windows_overlap():
+    assert _windows_overlap([(0, 60)], [(30, 90)])
+    assert not _windows_overlap([(0, 60)], [(60, 120)])
+    assert not _windows_overlap([], [(0, 60)])
+
+
+def test_windows_overlap_across_week_end():
+    # sunday 23:30 - monday 00:30 against monday 00:00 - 00:15
+    assert _windows_overlap(
+        _weekly_window("sun:23:30-mon:00:30"),
+        _weekly_window("mon:00:00-mon:00:15"),
+    )
+    # the last daily window crosses into the next week
+    assert _windows_overlap(
+        _daily_window("23:45-00:15"),
+        _weekly_window("mon:00:00-mon:00:30"),
+    )
+    assert not _windows_overlap(
+        _daily_window("23:00-23:30"),
+        _weekly_window("mon:00:00-mon:00:30"),
+    )
+
+
+def test_backup_plan_start_windows():
+    backup_plan_config = BackupPlanConfig(
+        cron={"hour": "19", "minute": "0"},
+        start_window=Duration.minutes(60),
+    )
+
+    assert backup_plan_config.start_windows[0] == (19 * 60, 20 * 60)
+    assert len(backup_plan_config.start_windows) == 7
+
+
+def test_backup_plan_start_windows_without_fixed_time():
+    assert BackupPlanConfig(cron={"minute": "*/30"}).start_windows == []
+
+
+def test_maintenance_config():
+    maintenance_config = MaintenanceConfig.from_object(
+        {
+            "maintenance": {
+                "preferredBackupWindow": "17:00-17:30",
+                "preferredMaintenanceWindow": "sat:18:00-sat:18:30",
+                "backupPlan": {
+                    "cron": {"hour": "19", "minute": "0"},
+                },
+            },
+        }
+    )
+
+    assert maintenance_config.preferred_backup_window == "17:00-17:30"
+    assert maintenance_config.backup_plan_config.cron == {
+        "hour": "19",
+        "minute": "0",
+    }
+
+
+def test_maintenance_config_without_maintenance():
+    maintenance_config = MaintenanceConfig.from_object({})
+
+    assert maintenance_config.preferred_backup_window is None
+    assert maintenance_config.backup_plan_config is None
+
+
+def test_maintenance_config_backup_overlaps_maintenance():
+    with pytest.raises(ValueError):
+        MaintenanceConfig(
+            preferred_backup_window="18:15-18:45",
+            preferred_maintenance_window="sat:18:00-sat:18:30",
+        )
+
+
+def test_maintenance_config_backup_overlaps_maintenance_across_midnight():
+    with pytest.raises(ValueError):
+        MaintenanceConfig(
+            preferred_backup_window="23:45-00:15",
+            preferred_maintenance_window="mon:00:00-mon:00:30",
+        )
+
+
+def test_maintenance_config_backup_plan_overlaps_backup():
+    with pytest.raises(ValueError):
+        MaintenanceConfig(
+            preferred_backup_window="19:30-20:00",
+            backup_plan_config=BackupPlanConfig(
+                cron={"hour": "19", "minute": "0"},
+                start_window=Duration.minutes(60),
+            ),
+        )
+
+
+def test_maintenance_config_backup_plan_overlaps_maintenance():
+    with pytest.raises(ValueError):
+        MaintenanceConfig(
+            preferred_maintenance_window="sat:19:30-sat:20:00",
+            backup_plan_config=BackupPlanConfig(
+                cron={"hour": "19", "minute": "0"},
+                start_window=Duration.minutes(60),
+            ),
+        )
+
+
+def test_aurora_version():
+    assert _aurora_version("3.04.0") == (3, 4, 0)
+
+
+def test_aurora_version_in_old_form():
+    with pytest.raises(ValueError):
+        _aurora_version("5.7.12")
+
+
+def test_secondary_region_config_io_optimized_on_old_version():
+    with pytest.raises(ValueError):
+        SecondaryRegionConfig.from_object(
+            {
+                "rds": {"serverless": False, "engineVersion": "3.02.0"},
+                "secondaryRegion": {
+                    "region": "us-west-2",
+                    "rds": {
+                        "instanceType": "db.r6g.large",
+                        "instances": 1,
+                        "storageType": "aurora-iopt1",
+                    },
+                },
+            },
+            repository=None,
+            secret=None,
+        )
+
+
+def _task_config(cpu: int, memory: int) -> TaskConfig:
+    return TaskConfig(
+        repository=None,
+        tag="latest",
+        container_name="app",
+        container_port=80,
+        secret=None,
+        secret_keys=[],
+        cpu=cpu,
+        memory=memory,
+    )
+
+
+def test_task_config_fargate_task_size():
+    task_config = _task_config(256, 512)
+
+    assert task_config.cpu == 256
+    assert task_config.memory == 512
+
+
+def test_task_config_memory_out_of_range():
+    with pytest.raises(ValueError):
+        _task_config(256, 4096)
+
+
+def test_task_config_memory_off_increment():
+    # 8192 cpu units take memory in 4096 MiB increments
+    with pytest.raises(ValueError):
+        _task_config(8192, 18432)